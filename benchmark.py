@@ -0,0 +1,269 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from statistics import mean
+from pyld import jsonld
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.loader import DocumentLoader
+from to_fairagro_json.synthetic import generate_arc_crate, generate_schemaorg_array
+
+STAGES = ("load_json", "expand", "normalize_schema", "frame", "map_entity", "serialize")
+DEFAULT_INPUTS = ("data/*.json", "data/schemaorg/*.json")
+DEFAULT_THRESHOLD = 0.10
+# Stage timings below this many seconds are too noisy to flag
+MIN_DELTA = 0.001
+DEFAULT_SIZES = (100, 1000, 10000)
+# Growth exponents (log time / log size) above this are reported as super-linear
+SUPERLINEAR_EXPONENT = 1.3
+
+
+def _timed(timings, stage, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings[stage] = time.perf_counter() - start
+    return result
+
+
+def run_once(converter, path):
+    """Runs one conversion stage by stage, returning (timings, datasets).
+
+    With the native framer, expansion and normalization happen inside the
+    frame stage and are not timed separately.
+    """
+    timings = {}
+    data = _timed(timings, "load_json", DocumentLoader.load_json, path)
+
+    if converter.framer == "pyld":
+        options = {"documentLoader": DocumentLoader.custom_document_loader}
+        expanded = _timed(timings, "expand", jsonld.expand, data, options)
+        expanded = _timed(timings, "normalize_schema", DocumentLoader.normalize_schema, expanded)
+        if len(expanded) == 1 and "@graph" in expanded[0]:
+            expanded = expanded[0]["@graph"]
+        framed = _timed(timings, "frame", jsonld.frame, expanded, converter.frame, options)
+        entities = DocumentLoader._framed_entities(framed)
+    else:
+        entities = _timed(
+            timings, "frame", DocumentLoader.frame_data, data, converter.frame, "native"
+        )
+
+    converter.use_entities(entities)
+    records = _timed(timings, "map_entity", converter._map_loaded)
+    output = converter._collect(records)
+    _timed(timings, "serialize", json.dumps, output, indent=2)
+    return timings, len(converter.entities)
+
+
+def benchmark_file(converter, path, repeat):
+    runs = []
+    for _ in range(repeat):
+        timings, datasets = run_once(converter, path)
+        runs.append(timings)
+
+    stages = {
+        stage: {
+            "min": min(run[stage] for run in runs),
+            "mean": mean(run[stage] for run in runs),
+        }
+        for stage in STAGES
+        if stage in runs[0]
+    }
+    total = min(sum(run.values()) for run in runs)
+    size = path.stat().st_size
+    return {
+        "file": str(path),
+        "profile": converter.profile,
+        "framer": converter.framer,
+        "bytes": size,
+        "datasets": datasets,
+        "stages": stages,
+        "total": total,
+        "datasets_per_s": datasets / total if total else None,
+        "mb_per_s": size / 1e6 / total if total else None,
+    }
+
+
+def _environment():
+    try:
+        pyld_version = version("pyld")
+    except PackageNotFoundError:
+        pyld_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pyld": pyld_version,
+    }
+
+
+def run_benchmark(paths, profiles, framer=None, repeat=3):
+    results = []
+    for profile in profiles:
+        converter = FairagroConverter(profile=profile, framer=framer)
+        for path in paths:
+            results.append(benchmark_file(converter, Path(path), repeat))
+    return {"environment": _environment(), "repeat": repeat, "results": results}
+
+
+def _synthetic(profile, size):
+    if profile == "rocrate":
+        return generate_arc_crate(studies=2, assays=2, samples=size, persons=10)
+    return generate_schemaorg_array(datasets=size)
+
+
+def run_scaling(profile, sizes=DEFAULT_SIZES, framer=None, repeat=1):
+    """Benchmarks synthetic inputs of growing size for one profile.
+
+    The size is the number of samples of an ARC crate (rocrate) or of datasets
+    in a Schema.org array (schemaorg). Each result after the first carries the
+    growth exponent of its total time relative to the previous size.
+    """
+    converter = FairagroConverter(profile=profile, framer=framer)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"{profile}-{size}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_synthetic(profile, size), f)
+            result = benchmark_file(converter, path, repeat)
+            result.update(file=f"synthetic/{profile}/{size}", size=size)
+            results.append(result)
+    for previous, result in zip(results, results[1:]):
+        result["exponent"] = math.log(result["total"] / previous["total"]) / math.log(
+            result["size"] / previous["size"]
+        )
+    return {"environment": _environment(), "repeat": repeat, "results": results}
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Returns the stages that got slower than baseline by more than threshold.
+
+    Runs are matched by (file, profile, framer) and compared on min times.
+    """
+    previous = {
+        (r["file"], r["profile"], r["framer"]): r for r in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        base = previous.get((result["file"], result["profile"], result["framer"]))
+        if base is None:
+            continue
+        timings = {stage: t["min"] for stage, t in result["stages"].items()}
+        timings["total"] = result["total"]
+        before = {stage: t["min"] for stage, t in base["stages"].items()}
+        before["total"] = base["total"]
+        for stage, seconds in timings.items():
+            old = before.get(stage)
+            if old is None or seconds - old < MIN_DELTA:
+                continue
+            if seconds > old * (1 + threshold):
+                regressions.append({
+                    "file": result["file"],
+                    "profile": result["profile"],
+                    "stage": stage,
+                    "baseline": old,
+                    "current": seconds,
+                    "ratio": seconds / old,
+                })
+    return regressions
+
+
+def _print_results(report):
+    header = f"{'file':45} {'profile':10}" + "".join(f"{s:>17}" for s in STAGES)
+    print(header + f"{'datasets/s':>12}{'MB/s':>9}")
+    for r in report["results"]:
+        cells = "".join(
+            f"{r['stages'][s]['min'] * 1000:15.2f}ms" if s in r["stages"] else f"{'-':>17}"
+            for s in STAGES
+        )
+        print(
+            f"{r['file']:45} {r['profile']:10}{cells}"
+            f"{r['datasets_per_s'] or 0:12.1f}{r['mb_per_s'] or 0:9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-stage benchmark of the converter over the bundled corpora"
+    )
+    parser.add_argument(
+        "inputs", nargs="*", help=f"Input files (defaults to {' '.join(DEFAULT_INPUTS)})"
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=["rocrate", "schemaorg"],
+        default=["rocrate", "schemaorg"],
+        help="Input profiles to run every file through",
+    )
+    parser.add_argument(
+        "--framer",
+        choices=["native", "pyld"],
+        help="JSON-LD framing engine (defaults to the profile's engine)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file and profile")
+    parser.add_argument(
+        "--scaling",
+        choices=["rocrate", "schemaorg"],
+        help="Benchmark synthetic inputs of growing size instead of files",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_SIZES),
+        help="Samples (rocrate) or datasets (schemaorg) per synthetic input",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown flagged as a regression (default 0.10)",
+    )
+    args = parser.parse_args()
+
+    if args.scaling:
+        report = run_scaling(
+            args.scaling, args.sizes, framer=args.framer, repeat=args.repeat
+        )
+    else:
+        paths = args.inputs or sorted(
+            str(p) for pattern in DEFAULT_INPUTS for p in Path().glob(pattern)
+        )
+        report = run_benchmark(
+            paths, args.profiles, framer=args.framer, repeat=args.repeat
+        )
+    _print_results(report)
+    for r in report["results"]:
+        if r.get("exponent", 0) > SUPERLINEAR_EXPONENT:
+            print(f"SUPER-LINEAR {r['file']}: time grows as size^{r['exponent']:.2f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['file']} [{r['profile']}] {r['stage']}: "
+                f"{r['baseline'] * 1000:.2f}ms -> {r['current'] * 1000:.2f}ms "
+                f"({r['ratio']:.2f}x)"
+            )
+        if regressions:
+            sys.exit(1)
+        print("No regressions against", args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import pytest
+
+from to_fairagro_json.snapshots import SNAPSHOT_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path_factory, monkeypatch):
+    """Keeps config snapshots of every test (and its workers) out of the home directory."""
+    path = tmp_path_factory.mktemp("snapshots")
+    monkeypatch.setenv(SNAPSHOT_DIR_ENV, str(path))
+    return path
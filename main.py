@@ -1,6 +1,15 @@
 import argparse
+import cProfile
+import json
+import sys
+import time
 from pathlib import Path
 from to_fairagro_json import FairagroConverter
+from to_fairagro_json.batch import DEFAULT_PATTERNS, convert_directory
+from to_fairagro_json.cli import add_context_options, apply_context_options
+from to_fairagro_json.converter import DEFAULT_CHUNK_SIZE
+from to_fairagro_json.instrument import Recorder
+from to_fairagro_json.sniff import AUTO_PROFILE, PROFILES, detect_profile, load_input
 
 
 def main():
@@ -9,25 +18,211 @@ def main():
     )
     parser.add_argument("input", help="Input path (file or directory)")
     parser.add_argument(
-        "--type", choices=["rocrate", "schemaorg"], required=True, help="Input type"
+        "--type",
+        choices=[*PROFILES, AUTO_PROFILE],
+        default=AUTO_PROFILE,
+        help="Input type (default: auto, detected per file from its first bytes)",
     )
     parser.add_argument(
         "--output",
-        help="Output JSON path (defaults to output/<input_filename>.fairagro.json)",
+        help="Output path (defaults to output/<input_filename>.fairagro.<format>); "
+        "the output directory for a directory input (defaults to output/)",
+    )
+    parser.add_argument(
+        "--glob",
+        action="append",
+        help="Glob pattern for files of a directory input; repeatable "
+        f"(defaults to {DEFAULT_PATTERNS[0]})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="Output layout: pretty JSON (default) or one compact record per line",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON output without indentation (faster and smaller)",
+    )
+    parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="Write each output to a temporary file and move it into place once "
+        "complete, instead of writing it as records are produced",
+    )
+    parser.add_argument(
+        "--framer",
+        choices=["native", "pyld"],
+        help="JSON-LD framing engine (defaults to the profile's engine)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read JSON arrays and NDJSON one dataset at a time to bound memory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Convert flat arrays per dataset across N processes, or the files "
+        "of a directory input (0 = all cores)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Datasets per worker task with --workers",
+    )
+    parser.add_argument(
+        "--result-cache",
+        help="Directory caching the records of unchanged datasets across runs "
+        "(implies per-dataset conversion as with --stream)",
+    )
+    add_context_options(parser)
+
+    parser.add_argument(
+        "--compact-graph",
+        action="store_true",
+        help="Intern strings and share repeated nodes of the framed graph to "
+        "reduce memory on large RO-Crates",
+    )
+    parser.add_argument(
+        "--dedup",
+        help="Directory of fingerprints of records written before; records with a "
+        "known DOI (or identical content) are left out, across files and runs",
+    )
+    parser.add_argument(
+        "--dedup-bloom",
+        type=int,
+        help="Expected number of fingerprints; indexes them in a Bloom filter of "
+        "bounded memory instead of an exact in-memory set",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate every record against fairagro-schema.json while converting; "
+        "exits with status 1 if any record is invalid",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write stage times and counters of a single-file conversion as JSON "
+        "to this path (stages run in worker processes are not included)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        help="Write cProfile statistics of the conversion to this path",
     )
 
     args = parser.parse_args()
+    is_directory = Path(args.input).is_dir()
+    if args.stream and args.workers is not None and not is_directory:
+        parser.error("--stream and --workers cannot be combined for a single file")
+
+    apply_context_options(args)
+
+    if is_directory:
+        summary = convert_directory(
+            args.input,
+            args.output or "output",
+            profile=args.type,
+            framer=args.framer,
+            patterns=args.glob or DEFAULT_PATTERNS,
+            workers=args.workers,
+            output_format=args.format,
+            compact=args.compact,
+            atomic=args.atomic,
+            stream=args.stream or bool(args.result_cache),
+            result_cache=args.result_cache,
+            validate=args.validate,
+            compact_graph=args.compact_graph,
+            dedup=args.dedup,
+            dedup_bloom=args.dedup_bloom,
+        )
+        print(
+            f"Converted {summary['converted']} of {summary['files']} files "
+            f"({summary['records']} records, {summary['failed']} failed) "
+            f"in {summary['seconds']}s"
+        )
+        if args.dedup:
+            print(f"{summary['duplicates']} duplicate records left out")
+        if args.validate:
+            print(f"{summary['invalid_records']} invalid records (see summary.json)")
+            if summary["invalid_records"]:
+                sys.exit(1)
+        return
 
     output_path = args.output
     if not output_path:
         input_name = Path(args.input).stem
-        output_path = f"output/{input_name}.fairagro.json"
+        output_path = f"output/{input_name}.fairagro.{args.format}"
 
-    converter = FairagroConverter(profile=args.type)
+    profile = args.type
+    data = args.input
+    if profile == AUTO_PROFILE:
+        # A plain conversion parses the bytes the profile is sniffed from; other
+        # modes read the input themselves, and --profile times its parsing
+        if args.workers is not None or args.stream or args.result_cache or args.profile:
+            profile = detect_profile(args.input)
+        else:
+            profile, data = load_input(args.input)
 
-    converter.load(args.input)
-    converter.convert(output_path)
+    recorder = Recorder() if args.profile else None
+    converter = FairagroConverter(
+        profile=profile,
+        framer=args.framer,
+        result_cache=args.result_cache,
+        observer=recorder,
+        validate=args.validate,
+        compact_graph=args.compact_graph,
+        dedup=args.dedup,
+        dedup_bloom=args.dedup_bloom,
+    )
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    start = time.perf_counter()
+    if args.workers is not None:
+        converter.convert_parallel(
+            args.input,
+            output_path,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            output_format=args.format,
+            compact=args.compact,
+            atomic=args.atomic,
+        )
+    elif args.stream or args.result_cache:
+        converter.convert_stream(
+            args.input, output_path, output_format=args.format, compact=args.compact,
+            atomic=args.atomic,
+        )
+    else:
+        converter.load(data)
+        converter.convert(
+            output_path, output_format=args.format, compact=args.compact, atomic=args.atomic
+        )
+    seconds = time.perf_counter() - start
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+
+    if recorder:
+        report = {"input": args.input, "seconds": round(seconds, 6), **recorder.report()}
+        with open(args.profile, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
     print(f"Successfully converted {args.input} to {output_path}")
+    if args.dedup:
+        print(f"{converter.duplicate_count} duplicate records left out")
+
+    if args.validate:
+        for failure in converter.validation_errors:
+            print(f"--- Issues in record {failure['record'] + 1} ({failure['identifier']}) ---")
+            for error in failure["errors"]:
+                print(f"Error at {error['path']}: {error['message']}")
+        if converter.validation_errors:
+            sys.exit(1)
+        print("All records passed validation")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+import json
+import shutil
+
+import pytest
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.batch import convert_directory, find_inputs
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    shutil.copy("data/schemaorg/bonares-schemaorg.json", root)
+    shutil.copy("data/schemaorg/thunen-schemaorg.json", root / "sub")
+    (root / "broken.json").write_text("{")
+    (root / "notes.txt").write_text("not json")
+    return root
+
+
+def test_inputs_are_scheduled_largest_first(input_dir):
+    names = [p.name for p in find_inputs(input_dir)]
+    assert names == ["thunen-schemaorg.json", "bonares-schemaorg.json", "broken.json"]
+    assert [p.name for p in find_inputs(input_dir, ["*.json"])][-1] == "broken.json"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_directory_conversion_writes_outputs_and_summary(input_dir, tmp_path, workers):
+    out = tmp_path / "out"
+    summary = convert_directory(input_dir, out, profile="schemaorg", workers=workers)
+
+    assert (summary["files"], summary["converted"], summary["failed"]) == (3, 2, 1)
+    assert json.loads((out / "summary.json").read_text()) == summary
+    failed = [r for r in summary["results"] if r["status"] == "failed"]
+    assert failed[0]["input"].endswith("broken.json")
+
+    converter = FairagroConverter(profile="schemaorg")
+    converter.load(input_dir / "sub" / "thunen-schemaorg.json")
+    expected = converter.convert()
+    output = out / "sub" / "thunen-schemaorg.fairagro.json"
+    assert json.loads(output.read_text()) == expected
+    assert summary["records"] == len(expected) + 1
@@ -0,0 +1,18 @@
+import copy
+
+from benchmark import compare, run_benchmark
+
+
+def test_benchmark_reports_stages_and_flags_regressions():
+    report = run_benchmark(
+        ["data/schemaorg/bonares-schemaorg.json"], ["schemaorg"], repeat=1
+    )
+    result = report["results"][0]
+    assert set(result["stages"]) == {"load_json", "frame", "map_entity", "serialize"}
+    assert result["datasets"] == 1
+    assert compare(report, report) == []
+
+    slower = copy.deepcopy(report)
+    slower["results"][0]["stages"]["frame"]["min"] += 1.0
+    regressions = compare(slower, report)
+    assert [r["stage"] for r in regressions] == ["frame"]
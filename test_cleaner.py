@@ -0,0 +1,19 @@
+from to_fairagro_json.cleaner import StringCleaner
+
+
+def test_clean_normalizes_html_and_special_characters():
+    raw = "  <p>Grünland &amp; “Boden” – Müller</p>\n\t"
+    assert StringCleaner.clean(raw) == "Gruenland & 'Boden' - Mueller"
+
+
+def test_clean_returns_clean_ascii_unchanged():
+    s = "Solanum tuberosum"
+    assert StringCleaner.clean(s) is s
+    assert StringCleaner.clean(42) == 42
+
+
+def test_clean_many_preserves_order_and_memoizes():
+    StringCleaner.cache_clear()
+    values = ["Thünen  Institut", None, "Thünen  Institut"]
+    assert StringCleaner.clean_many(values) == ["Thuenen Institut", None, "Thuenen Institut"]
+    assert StringCleaner.cache_info().hits >= 1
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from to_fairagro_json.contexts import ContextStore, ContextUnavailableError, fetch
+from to_fairagro_json.diskcache import LOW_WATER_MARK, DiskCache
+
+
+def test_offline_store_fails_fast_on_unknown_context():
+    store = ContextStore(offline=True)
+    with pytest.raises(ContextUnavailableError):
+        store.load("https://example.org/unknown-context.jsonld")
+
+
+def test_preloaded_contexts_are_served_offline(tmp_path):
+    ctx = {"@context": {"@vocab": "https://example.org/vocab#"}}
+    (tmp_path / "example.jsonld").write_text(json.dumps(ctx))
+    (tmp_path / "contexts.json").write_text(
+        json.dumps({"https://example.org/context": "example.jsonld"})
+    )
+
+    store = ContextStore(offline=True)
+    assert store.preload(tmp_path) == 1
+    assert store.load("https://example.org/context") == ctx
+
+
+def test_cached_contexts_persist_across_stores(tmp_path):
+    ctx = {"@context": {"name": "https://schema.org/name"}}
+    ContextStore(cache_dir=tmp_path).add("https://example.org/ctx", ctx)
+
+    reopened = ContextStore(cache_dir=tmp_path, offline=True)
+    assert reopened.load("https://example.org/ctx") == ctx
+
+
+def test_concurrent_stores_merge_the_url_index(tmp_path):
+    first = ContextStore(cache_dir=tmp_path)
+    second = ContextStore(cache_dir=tmp_path)
+    first.add("https://example.org/a", {"@context": {"a": "https://example.org/a#"}})
+    second.add("https://example.org/b", {"@context": {"b": "https://example.org/b#"}})
+
+    reopened = ContextStore(cache_dir=tmp_path, offline=True)
+    assert reopened.load("https://example.org/a") and reopened.load("https://example.org/b")
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []
+
+
+class _ContextHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        if self.path == "/context.jsonld":
+            body = b'{"@context": {"@vocab": "https://schema.org/"}}'
+            self.send_header("Content-Type", "application/ld+json")
+        else:
+            body = b"<html></html>"
+            self.send_header("Content-Type", "text/html")
+        self.send_header("Link", '</context.jsonld>; rel="alternate"; type="application/ld+json"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_follows_alternate_link():
+    server = HTTPServer(("127.0.0.1", 0), _ContextHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/"
+        assert fetch(url) == {"@context": {"@vocab": "https://schema.org/"}}
+    finally:
+        server.shutdown()
+    with pytest.raises(ValueError):
+        fetch("file:///etc/passwd")
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=12)
+    cache.put("aa01", b"12345")
+    cache.put("bb02", b"67890")
+    os.utime(tmp_path / "aa" / "aa01", (1, 1))
+    os.utime(tmp_path / "bb" / "bb02", (2, 2))
+    cache.put("cc03", b"abcde")
+
+    assert "aa01" not in cache
+    assert "bb02" in cache
+    assert cache.get("cc03") == b"abcde"
+    assert cache.size <= 12 * LOW_WATER_MARK
+
+
+def test_disk_cache_scans_rarely(tmp_path, monkeypatch):
+    scans = []
+    entries = DiskCache._entries
+    monkeypatch.setattr(DiskCache, "_entries", lambda self: scans.append(1) or entries(self))
+    cache = DiskCache(tmp_path, max_bytes=1000)
+    for i in range(100):
+        cache.put(f"{i:04x}", b"0123456789")
+    assert cache.get("0000") is not None
+    assert DiskCache(tmp_path, max_bytes=1000).get("0001") is not None
+    scans.clear()
+
+    # At the bound, each eviction frees room for several more blobs
+    for i in range(100, 200):
+        cache.put(f"{i:04x}", b"0123456789")
+    assert len(scans) <= 10
+    assert cache.size <= 1000
@@ -0,0 +1,110 @@
+import json
+import shutil
+
+import pytest
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.batch import convert_directory
+from to_fairagro_json.dedup import FingerprintSet, record_fingerprint, record_key
+
+OPENAGRAR = "data/schemaorg/openagrar-schemaorg.json"
+
+
+def _record(identifier, *other_ids, title="A"):
+    return {
+        "citation": {
+            "title": title,
+            "otherId": [{"otherIdValue": v, "otherIdAgency": "Other"} for v in other_ids],
+        },
+        "identifier": identifier,
+    }
+
+
+def test_record_key_uses_dois_only():
+    assert record_key(_record("https://doi.org/10.1594/PANGAEA.1")) == "10.1594/pangaea.1"
+    assert record_key(_record("local-7", "Unknown", "doi:10.1594/pangaea.1")) == "10.1594/pangaea.1"
+    assert record_key(_record("local-7", "TI-Template")) is None
+    assert record_key(_record("Child table of dataset https://doi.org/10.1/x")) is None
+
+
+def test_fingerprint_by_doi_else_content():
+    mirror = _record("10.1594/pangaea.1", title="Copy")
+    assert record_fingerprint(_record("https://doi.org/10.1594/PANGAEA.1")) == record_fingerprint(mirror)
+    assert record_fingerprint(_record("a")) != record_fingerprint(_record("a", title="B"))
+    assert record_fingerprint(_record("a")) == record_fingerprint(_record("a"))
+
+
+@pytest.mark.parametrize("bloom_capacity", [None, 1])
+def test_fingerprint_set_persists(tmp_path, bloom_capacity):
+    fingerprints = [record_fingerprint(_record(str(i))) for i in range(50)]
+    first = FingerprintSet(tmp_path, bloom_capacity)
+    assert all(first.add(fp) for fp in fingerprints[:25])
+    assert not first.add(fingerprints[0])
+
+    # A saturated Bloom filter (capacity 1) still never drops a new fingerprint
+    second = FingerprintSet(tmp_path, bloom_capacity)
+    assert [second.add(fp) for fp in fingerprints] == [False] * 25 + [True] * 25
+    assert not first.add(fingerprints[30])
+
+
+def test_rolled_back_claims_are_free_for_other_instances(tmp_path):
+    fingerprint = record_fingerprint(_record("a"))
+    first, second = FingerprintSet(tmp_path), FingerprintSet(tmp_path)
+    assert first.claim(fingerprint)
+    assert not second.claim(fingerprint)
+
+    first.discard()
+    assert second.claim(fingerprint)
+    assert not first.claim(fingerprint)
+    second.commit()
+    assert not FingerprintSet(tmp_path, bloom_capacity=10).add(fingerprint)
+
+
+def test_parallel_workers_share_fingerprints(tmp_path):
+    single = FairagroConverter(profile="schemaorg", dedup=tmp_path / "single")
+    single.load(OPENAGRAR)
+    expected = len(single.convert())
+
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    shutil.copy(OPENAGRAR, input_dir / "a.json")
+    shutil.copy(OPENAGRAR, input_dir / "b.json")
+    summary = convert_directory(
+        input_dir, tmp_path / "out", profile="schemaorg", workers=2, dedup=tmp_path / "seen"
+    )
+    assert summary["converted"] == 2
+    assert summary["records"] == expected
+
+
+def test_converter_drops_duplicates_across_runs(tmp_path):
+    converter = FairagroConverter(profile="schemaorg", dedup=tmp_path)
+    converter.load(OPENAGRAR)
+    records = converter.convert()
+    dois = [record_key(r) for r in records]
+    assert converter.duplicate_count == 7
+    assert len([d for d in dois if d]) == len({d for d in dois if d})
+
+    again = FairagroConverter(profile="schemaorg", dedup=tmp_path)
+    output = tmp_path / "out.ndjson"
+    assert again.convert_stream(OPENAGRAR, output, "ndjson") == 0
+    assert again.duplicate_count == len(json.loads(open(OPENAGRAR).read()))
+
+
+def test_failed_conversion_leaves_records_to_the_next_run(tmp_path):
+    datasets = json.loads(open(OPENAGRAR).read())[:3]
+    source = tmp_path / "in.ndjson"
+    lines = [json.dumps(d) for d in datasets]
+    source.write_text("\n".join(lines + ["{truncated"]) + "\n")
+    output = tmp_path / "out.ndjson"
+    store = tmp_path / "seen"
+
+    failed = FairagroConverter(profile="schemaorg", dedup=store)
+    with pytest.raises(ValueError):
+        failed.convert_stream(source, output, "ndjson", atomic=True)
+    assert not output.exists()
+
+    source.write_text("\n".join(lines) + "\n")
+    rerun = FairagroConverter(profile="schemaorg", dedup=store)
+    assert rerun.convert_stream(source, output, "ndjson") == 3
+    assert rerun.duplicate_count == 0
+    assert FairagroConverter(profile="schemaorg", dedup=store).convert_stream(source) is None
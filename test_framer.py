@@ -0,0 +1,73 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from to_fairagro_json.framer import NativeFramer, UnsupportedFeature
+from to_fairagro_json.loader import DocumentLoader
+
+SCHEMAORG_FRAME = json.loads(Path("config/schemaorg/frame.json").read_text())
+ROCRATE_FRAME = json.loads(Path("config/rocrate/frame.json").read_text())
+
+CRATE = {
+    "@context": {"@vocab": "https://schema.org/", "schema": "http://schema.org/"},
+    "@graph": [
+        {
+            "@id": "#a",
+            "@type": ["Dataset", "Dataset"],
+            "name": ["n", "n", 1, True],
+            "creator": [{"@id": "#p"}, {"@id": "#p"}],
+            "author": {"@type": "Person", "name": "Anon"},
+            "hasPart": {"@id": "#b"},
+            "schema:keywords": "k",
+            "description": [],
+        },
+        {"@id": "#b", "@type": "Dataset", "isPartOf": {"@id": "#a"}, "about": {"@id": "_:x"}},
+        {"@id": "#p", "@type": "Person", "name": "P", "affiliation": {"@id": "_:x"}},
+        {"@id": "_:x", "name": "shared", "url": {"@id": "https://schema.org/Thing"}},
+        {"@id": "#only"},
+    ],
+}
+
+
+def frame_both(data, frame):
+    expected = DocumentLoader.frame_data(copy.deepcopy(data), copy.deepcopy(frame))
+    framed = NativeFramer(frame, DocumentLoader.custom_document_loader).frame(data)
+    return expected, framed.get("@graph", [framed])
+
+
+@pytest.mark.parametrize("name", ["bonares", "edal", "publisso", "thunen"])
+def test_native_framer_matches_pyld_on_schemaorg_data(name):
+    data = json.loads(Path(f"data/schemaorg/{name}-schemaorg.json").read_text())
+    expected, framed = frame_both(data, SCHEMAORG_FRAME)
+    assert json.dumps(framed) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("frame", [SCHEMAORG_FRAME, ROCRATE_FRAME])
+def test_native_framer_matches_pyld_on_shared_and_cyclic_nodes(frame):
+    expected, framed = frame_both(CRATE, frame)
+    assert json.dumps(framed) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("frame", [SCHEMAORG_FRAME, ROCRATE_FRAME])
+def test_literals_do_not_match_node_patterns(frame):
+    # As pyld 3 frames them; pyld 2 fails on such input
+    crate = copy.deepcopy(CRATE)
+    crate["@graph"][0]["creator"].append("Plain Name")
+    framed = NativeFramer(frame, DocumentLoader.custom_document_loader).frame(crate)
+    [dataset] = [n for n in framed["@graph"] if n.get("creator")]
+    assert dataset["creator"]["name"] == "P"
+
+
+def test_unsupported_input_falls_back_to_pyld():
+    data = {
+        "@context": {"@vocab": "https://schema.org/"},
+        "@type": "Dataset",
+        "keywords": {"@list": ["a", "b"]},
+    }
+    with pytest.raises(UnsupportedFeature):
+        NativeFramer(SCHEMAORG_FRAME, DocumentLoader.custom_document_loader).frame(data)
+
+    native = DocumentLoader.frame_data(data, SCHEMAORG_FRAME, engine="native")
+    assert native == DocumentLoader.frame_data(data, SCHEMAORG_FRAME)
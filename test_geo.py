@@ -0,0 +1,101 @@
+import pytest
+
+from to_fairagro_json import geo
+from to_fairagro_json.mapper import MetadataMapper
+
+
+def test_parse_coordinates_handles_separators_and_noise():
+    assert list(geo.parse_coordinates("54.3,9.9 54.4, 10")) == [54.3, 9.9, 54.4, 10.0]
+    # Falls back to the number pattern for anything but plain number lists
+    assert list(geo.parse_coordinates("N 54.3 E 9.9 1-2")) == [54.3, 9.9, 1.0, -2.0]
+
+
+def test_shape_bounds_covers_every_shape():
+    place = {
+        "@type": "Place",
+        "geo": {
+            "@type": "GeoShape",
+            "box": {"@language": "en", "@value": "54.31 9.99 54.32 9.996"},
+            "polygon": "50 8 51 9 49 7.5 50 8",
+        },
+    }
+    point = {"@type": "GeoCoordinates", "latitude": "55.5", "longitude": 10}
+    assert geo.shape_bounds([place, {"geo": point}]) == {
+        "westLongitude": 7.5,
+        "eastLongitude": 10.0,
+        "northLatitude": 55.5,
+        "southLatitude": 49.0,
+    }
+    assert geo.shape_bounds({"line": [1, 2, 3, 4.5]})["eastLongitude"] == 4.5
+
+
+def test_shape_bounds_ignores_values_without_coordinates():
+    assert geo.shape_bounds("Germany") == {}
+    assert geo.shape_bounds("54.3 9.9") == {}
+    assert geo.shape_bounds({"@type": "GeoShape", "box": None, "polygon": None}) == {}
+    assert geo.shape_bounds({"latitude": "n/a", "longitude": 9}) == {}
+
+
+def test_numpy_bounds_match_pure_python(monkeypatch):
+    np = pytest.importorskip("numpy")
+    polygon = " ".join(f"{50 + i % 7 * 0.25} {8 - i % 11 * 0.5}" for i in range(600))
+    shapes = [{"polygon": polygon}, {"box": "49.5 7 49.75 7.5"}, {"line": [1, 2, 3, 4.5]}]
+    expected = geo.shape_bounds(shapes)
+    coords = list(geo.parse_coordinates(polygon))
+
+    # The polygon alone is above the default threshold
+    assert isinstance(geo.parse_coordinates(polygon), np.ndarray)
+    monkeypatch.setattr(geo, "NUMPY_MIN_VALUES", float("inf"))
+    assert list(geo.parse_coordinates(polygon)) == coords
+    assert geo.shape_bounds(shapes) == expected
+
+    monkeypatch.setattr(geo, "NUMPY_MIN_VALUES", 4)
+    assert isinstance(geo.parse_coordinates("49.5 7 49.75 7.5"), np.ndarray)
+    assert geo.shape_bounds(shapes) == expected
+
+
+def test_mapper_maps_polygons_and_resolves_references():
+    mapping = {
+        "blocks": {
+            "geographic": {
+                "fields": [{
+                    "geographicBoundingBox": {
+                        "source": ["spatialCoverage.geo"],
+                        "type": "complex_list",
+                        "mapping": {"westLongitude": {"source": ["_geo_west"]}},
+                    }
+                }]
+            }
+        }
+    }
+    shape = {"@id": "#shape", "@type": "GeoShape", "polygon": "10 20 11 21 10 22"}
+    entity = {"@id": "#ds", "spatialCoverage": {"geo": {"@id": "#shape"}}}
+    result = MetadataMapper(mapping, all_entities=[entity, shape]).map_entity(entity)
+    assert result["geographic"]["westLongitude"] == 20.0
+    assert result["geographic"]["northLatitude"] == 11.0
+
+    entity = {"@id": "#ds", "spatialCoverage": "Germany"}
+    assert "geographic" not in MetadataMapper(mapping, all_entities=[entity]).map_entity(entity)
+
+
+def test_mapper_wraps_bounding_box_sides():
+    mapping = {
+        "blocks": {
+            "geographic": {
+                "fields": [{
+                    "geographicBoundingBox": {
+                        "source": ["spatialCoverage"],
+                        "type": "complex_list",
+                        "mapping": {
+                            "westLongitude": {"source": ["_geo_west"], "wrap": True},
+                            "eastLongitude": {"source": ["_geo_east"]},
+                        },
+                    }
+                }]
+            }
+        }
+    }
+    entity = {"@id": "#ds", "spatialCoverage": {"geo": {"box": "54.3 9.9 54.4 10"}}}
+    result = MetadataMapper(mapping, all_entities=[entity]).map_entity(entity)["geographic"]
+    assert result["westLongitude"] == {"value": "9.9", "aiGenerated": False}
+    assert result["eastLongitude"] == 10.0
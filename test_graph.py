@@ -0,0 +1,33 @@
+import json
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.graph import compact_entities
+
+PERSON = {"@id": "#p", "@type": "Person", "name": "P", "affiliation": {"name": "Org"}}
+
+
+def test_identical_nodes_are_shared():
+    entities = [
+        {"@id": "#a", "creator": json.loads(json.dumps(PERSON)), "n": [1, True, 1.0]},
+        {"@id": "#b", "creator": json.loads(json.dumps(PERSON)), "n": [1, True, 1.0]},
+        {"@id": "#c", "creator": dict(PERSON, name="Q")},
+    ]
+    compacted = compact_entities(entities)
+    assert compacted == entities
+    a, b, c = compacted
+    assert a["creator"] is b["creator"]
+    assert a["n"] is b["n"] and a["n"] == [1, True, 1.0]
+    assert [type(v) for v in a["n"]] == [int, bool, float]
+    assert c["creator"] is not a["creator"]
+    assert c["creator"]["affiliation"] is a["creator"]["affiliation"]
+
+
+def test_compact_graph_keeps_output():
+    converters = [
+        FairagroConverter(profile="rocrate", compact_graph=flag) for flag in (False, True)
+    ]
+    outputs = []
+    for converter in converters:
+        converter.load("data/arc-ro-crate-metadata.json")
+        outputs.append(json.dumps(converter.convert()))
+    assert outputs[0] == outputs[1]
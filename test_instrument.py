@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.instrument import Recorder
+from to_fairagro_json.mapper import MetadataMapper
+
+EDAL = Path("data/schemaorg/edal-schemaorg.json")
+
+
+def test_recorder_collects_stages_and_counters(tmp_path):
+    recorder = Recorder()
+    converter = FairagroConverter(profile="schemaorg", observer=recorder)
+    converter.load(EDAL)
+    result = converter.convert(tmp_path / "out.json")
+
+    plain = FairagroConverter(profile="schemaorg")
+    plain.load(EDAL)
+    assert result == plain.convert()
+
+    report = recorder.report()
+    assert set(report["stages"]) == {"load_json", "frame", "map_entity", "serialize"}
+    counters = report["counters"]
+    assert counters["entities.framed"] == counters["records.mapped"] == len(result)
+    assert counters["get_literal.calls"] > 0
+    assert counters["cleaner.calls"] > 0
+
+
+def test_reference_misses_are_counted():
+    recorder = Recorder()
+    mapper = MetadataMapper(
+        {"fairagro": {}}, all_entities=[{"@id": "#a", "name": "A"}], observer=recorder
+    )
+    assert mapper._get_literal({"@id": "#a"}) == "A"
+    assert mapper._resolve_ref({"@id": "#missing"}) == {"@id": "#missing"}
+    assert recorder.counters["resolve_ref.calls"] == 2
+    assert recorder.counters["resolve_ref.misses"] == 1
+    assert recorder.counters["get_literal.calls"] == 3
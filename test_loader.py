@@ -0,0 +1,33 @@
+import pytest
+
+from to_fairagro_json.contexts import ContextStore, ContextUnavailableError
+from to_fairagro_json.loader import DocumentLoader
+
+
+def test_normalize_schema_rewrites_in_place():
+    data = [
+        {
+            "a": 1,
+            "http://schema.org/name": ["http://schema.org/x", {"@id": "http://schema.org/y"}],
+            "https://schema.org/url": "keep",
+        },
+        {"https://schema.org/k": 1, "http://schema.org/k": 2},
+    ]
+    result = DocumentLoader.normalize_schema(data)
+    assert result is data
+    assert list(data[0]) == ["a", "https://schema.org/name", "https://schema.org/url"]
+    assert data[0]["https://schema.org/name"] == [
+        "https://schema.org/x", {"@id": "https://schema.org/y"}
+    ]
+    # Renamed keys overwrite earlier duplicates, as a freshly built dict would
+    assert data[1] == {"https://schema.org/k": 2}
+    assert DocumentLoader.normalize_schema("http://schema.org/Dataset") == "https://schema.org/Dataset"
+    assert DocumentLoader.normalize_schema(3) == 3
+
+
+@pytest.mark.parametrize("engine", ["native", "pyld"])
+def test_offline_frame_reports_missing_context(monkeypatch, engine):
+    monkeypatch.setattr(DocumentLoader, "context_store", ContextStore(offline=True))
+    data = {"@context": "https://example.org/missing-context.jsonld", "@id": "#a", "name": "A"}
+    with pytest.raises(ContextUnavailableError):
+        DocumentLoader.frame_data(data, {"@type": "Dataset"}, engine=engine)
@@ -0,0 +1,129 @@
+import pytest
+
+from to_fairagro_json import MappingError
+from to_fairagro_json.mapper import MetadataMapper
+
+
+def test_resolve_ref_uses_nested_nodes():
+    person = {"@id": "#p1", "@type": "Person", "name": "Jane Doe"}
+    dataset = {"@id": "#ds", "@type": "Dataset", "creator": [person]}
+    other = {"@id": "#other", "@type": "Dataset", "creator": {"@id": "#p1"}}
+
+    mapper = MetadataMapper({}, all_entities=[dataset, other])
+    assert mapper._resolve_ref({"@id": "#p1"}) is person
+    assert mapper._resolve_ref({"@id": "#ds"}) is dataset
+    assert mapper._resolve_ref({"@id": "#missing"}) == {"@id": "#missing"}
+
+
+def test_resolve_ref_prefers_top_level_entities():
+    nested = {"@id": "#p1", "name": "Nested"}
+    top = {"@id": "#p1", "name": "Top"}
+    mapper = MetadataMapper({}, all_entities=[{"@id": "#ds", "creator": nested}, top])
+    assert mapper._resolve_ref({"@id": "#p1"}) is top
+
+
+def test_node_index_follows_reassignment():
+    mapper = MetadataMapper({})
+    assert mapper._resolve_ref({"@id": "#p1"}) == {"@id": "#p1"}
+
+    person = {"@id": "#p1", "name": "Jane Doe"}
+    mapper.all_entities = [person]
+    assert mapper._get_literal({"@id": "#p1"}) == "Jane Doe"
+
+
+def test_entities_by_type_keeps_document_order():
+    study = {"@id": "#s", "@type": "Dataset", "additionalType": "Study"}
+    assay = {"@id": "#a", "@type": ["Dataset"], "additionalType": ["Assay", "Study"]}
+    plain = {"@id": "#d", "@type": "Dataset"}
+    person = {"@id": "#p", "@type": "Person"}
+
+    mapper = MetadataMapper({}, all_entities=[assay, person, study, plain])
+    assert mapper._get_entities_by_type("Dataset") == [assay, study, plain]
+    assert mapper._get_entities_by_type("Dataset", ["Study", "Assay"]) == [assay, study]
+    assert mapper._get_entities_by_type("Dataset", ["Investigation"]) == []
+
+
+def test_person_records_are_shared_across_mappers():
+    person = {"@type": "Person", "name": "Jane Doe", "identifier": "https://orcid.org/1"}
+    cache = {}
+    records = []
+    for i in range(3):
+        # Equal but distinct nodes, as in separately framed datasets
+        dataset = {"@id": f"#ds{i}", "@type": "Dataset", "creator": [dict(person)]}
+        mapper = MetadataMapper({}, all_entities=[dataset], person_cache=cache)
+        records.extend(mapper._extract_authors())
+    assert len(cache) == 1
+    assert records[0] == {
+        "authorName": "Jane Doe", "authorAffiliation": "Unknown",
+        "authorIdentifier": "Unknown", "authorIdentifierScheme": "Other",
+    }
+    assert records[0] == records[1] == records[2]
+    assert records[0] is not records[1]
+
+
+def test_person_with_bare_reference_is_not_cached():
+    org = {"@id": "#org", "@type": "Organization", "name": "Institute"}
+    person = {"@type": "Person", "name": "Jane Doe", "affiliation": {"@id": "#org"}}
+    dataset = {"@id": "#ds", "@type": "Dataset", "creator": person}
+    cache = {}
+    mapper = MetadataMapper({}, all_entities=[dataset, org], person_cache=cache)
+    assert mapper._extract_authors()[0]["authorAffiliation"] == "Institute"
+    assert cache == {}
+
+
+def test_process_graph_nodes_are_read_once_per_load():
+    organism = {"@id": "#o", "name": "Organism", "value": "Zea mays", "valueRef": "uri"}
+    sample = {"@id": "#s1", "@type": "Sample", "additionalProperty": [{"@id": "#o"}]}
+    drone = {"@id": "#d", "name": "Drone Model", "value": "M4D"}
+    proc = {
+        "@id": "#proc", "@type": "LabProcess", "object": {"@id": "#s1"},
+        "parameterValue": [{"@id": "#d"}],
+    }
+    entities = [organism, sample, drone, proc] + [
+        {"@id": f"#{kind}{i}", "@type": "Dataset", "additionalType": kind,
+         "about": [{"@id": "#proc"}]}
+        for kind in ("Study", "Assay") for i in range(3)
+    ]
+    mapper = MetadataMapper({}, all_entities=entities)
+    assert mapper._extract_crops() == [{
+        "_crop_species": "Zea mays", "_crop_species_uri": "uri",
+    }]
+    assert [s["sensorIsHostedBy"]["_model"] for s in mapper._extract_sensors()] == ["M4D"]
+    assert list(mapper._crop_memo.values()) == [mapper._extract_crops()[0]]
+    assert list(mapper._drone_memo.values()) == [("", "M4D")]
+
+    mapper.all_entities = []
+    assert mapper._crop_memo == {} and mapper._drone_memo == {}
+
+
+def test_mapping_errors_are_reported_at_compile_time():
+    bad_type = {"blocks": {"citation": {"fields": [{"title": {"type": "text"}}]}}}
+    with pytest.raises(MappingError, match="unknown type"):
+        MetadataMapper(bad_type)
+
+    bad_source = {"blocks": {"citation": {"fields": [{"title": {"source": "name"}}]}}}
+    with pytest.raises(MappingError, match="list of strings"):
+        MetadataMapper(bad_source)
+
+
+def test_compiled_plan_maps_sources_and_defaults():
+    mapping = {
+        "blocks": {
+            "generalExtended": {
+                "fields": [
+                    {"license": {"source": ["license"], "type": "string", "default": ""}},
+                    {"keyword": {
+                        "source": ["keywords"],
+                        "type": "complex_list",
+                        "mapping": {"keywordValue": ["@"]},
+                    }},
+                ]
+            }
+        }
+    }
+    entity = {"@id": "#ds", "keywords": ["soil", "maize"]}
+    result = MetadataMapper(mapping, all_entities=[entity]).map_entity(entity)
+    assert result["generalExtended"] == {
+        "license": "",
+        "keyword": [{"keywordValue": "soil"}, {"keywordValue": "maize"}],
+    }
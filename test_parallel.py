@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from to_fairagro_json import FairagroConverter
+
+
+def canonical(records):
+    return sorted(json.dumps(r, sort_keys=True) for r in records)
+
+
+@pytest.mark.parametrize("name", ["publisso", "thunen"])
+def test_sharded_conversion_matches_sequential_records(name):
+    path = Path(f"data/schemaorg/{name}-schemaorg.json")
+    converter = FairagroConverter(profile="schemaorg")
+    converter.load(path)
+    expected = converter.convert()
+
+    sharded = converter.convert_parallel(path, workers=1)
+    assert canonical(sharded) == canonical(expected)
+
+
+def test_sharded_conversion_keeps_input_order_across_workers():
+    path = Path("data/schemaorg/thunen-schemaorg.json")
+    converter = FairagroConverter(profile="schemaorg")
+    sequential = converter.convert_parallel(path, workers=1)
+    parallel = converter.convert_parallel(path, workers=3, chunk_size=5)
+    assert parallel == sequential
+
+    datasets = json.loads(path.read_text())
+    assert len(parallel) == len(datasets)
+    for i in (0, 7, len(datasets) - 1):
+        assert parallel[i] == converter.convert_datasets([datasets[i]])[0]
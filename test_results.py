@@ -0,0 +1,33 @@
+import json
+from pathlib import Path
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.results import ResultCache
+
+THUNEN = Path("data/schemaorg/thunen-schemaorg.json")
+
+
+def test_unchanged_datasets_are_served_from_the_cache(tmp_path):
+    expected = FairagroConverter(profile="schemaorg").convert_stream(THUNEN)
+
+    first = FairagroConverter(profile="schemaorg", result_cache=tmp_path)
+    assert first.convert_stream(THUNEN) == expected
+    assert first.result_cache.hits == 0
+
+    second = FairagroConverter(profile="schemaorg", result_cache=tmp_path)
+    second.load = None  # Any framing would fail
+    assert second.convert_stream(THUNEN) == expected
+    assert second.result_cache.hits == len(expected)
+
+
+def test_keys_follow_canonical_content_and_config(tmp_path):
+    cache = ResultCache(tmp_path, "config-a")
+    dataset = {"name": "x", "keywords": ["a", "b"]}
+    reordered = json.loads('{"keywords": ["a", "b"], "name": "x"}')
+    assert cache.key(dataset) == cache.key(reordered)
+    assert cache.key(dataset) != cache.key({"name": "y", "keywords": ["a", "b"]})
+    assert cache.key(dataset) != ResultCache(tmp_path, "config-b").key(dataset)
+
+    converter = FairagroConverter(profile="schemaorg")
+    assert converter.config_hash != FairagroConverter(profile="rocrate").config_hash
+    assert converter.config_hash != FairagroConverter(framer="pyld").config_hash
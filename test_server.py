@@ -0,0 +1,92 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.server import ConversionServer
+
+THUNEN = Path("data/schemaorg/thunen-schemaorg.json")
+ARC = Path("data/arc-ro-crate-metadata.json")
+
+
+async def _read_response(reader):
+    status = (await reader.readline()).decode().split(" ", 2)[1]
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = b""
+    while size := int(await reader.readline(), 16):
+        body += await reader.readexactly(size + 2)
+        body = body[:-2]
+    await reader.readline()
+    return int(status), headers, body
+
+
+def _request(requests):
+    """Sends (method, path, body) requests over one connection to a fresh server."""
+
+    async def run():
+        server = ConversionServer(workers=0)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for method, path, body in requests:
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            responses.append(await _read_response(reader))
+        writer.close()
+        server.close()
+        return responses
+
+    return asyncio.run(run())
+
+
+def _expected(profile, path):
+    converter = FairagroConverter(profile=profile)
+    converter.load(str(path))
+    return converter.convert()
+
+
+@pytest.mark.parametrize("profile,path", [("schemaorg", THUNEN), ("rocrate", ARC)])
+def test_convert_matches_converter(profile, path):
+    [(status, headers, body)] = _request([("POST", f"/convert?type={profile}", path.read_bytes())])
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert json.loads(body) == _expected(profile, path)
+
+
+def test_type_defaults_to_auto_detection():
+    [(status, _, body)] = _request([("POST", "/convert", ARC.read_bytes())])
+    assert status == 200
+    assert json.loads(body) == _expected("rocrate", ARC)
+
+
+def test_ndjson_and_keep_alive():
+    records = json.loads(THUNEN.read_bytes())[:2]
+    first, second = _request([
+        ("POST", "/convert?type=schemaorg&format=ndjson", json.dumps(records).encode()),
+        ("GET", "/health", b""),
+    ])
+    assert first[0] == 200
+    assert len(first[2].splitlines()) == 2
+    assert second[0] == 200 and json.loads(second[2])["status"] == "ok"
+
+
+def test_errors():
+    responses = _request([
+        ("POST", "/convert?type=schemaorg", b"{not json"),
+        ("POST", "/convert?type=csv", b"{}"),
+        ("GET", "/convert?type=schemaorg", b""),
+        ("GET", "/missing", b""),
+        ("POST", "/convert?type=schemaorg&target=../schemaorg", b"{}"),
+        ("POST", "/convert?type=schemaorg&target=unknown", b"{}"),
+    ])
+    assert [status for status, _, _ in responses] == [400, 400, 405, 404, 400, 400]
+    assert "Invalid JSON" in json.loads(responses[0][2])["error"]
+    assert "target must be one of fairagro" in json.loads(responses[-1][2])["error"]
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from to_fairagro_json import jsonio
+from to_fairagro_json.sinks import open_sink
+
+RECORDS = [{"citation": {"title": "A", "n": [1, 2]}}, {"b": {}}, {"c": "x\ny"}]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3])
+def test_json_sink_matches_json_dump(tmp_path, count):
+    records = RECORDS[:count]
+    expected = records[0] if count == 1 else records
+    path = tmp_path / "out" / "records.json"
+    with open_sink(path) as sink:
+        for record in records:
+            sink.write(record)
+    assert path.read_text() == json.dumps(expected, indent=2)
+    assert sink.count == count
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_compact_json_sink(tmp_path, count):
+    records = RECORDS[:count]
+    expected = records[0] if count == 1 else records
+    path = tmp_path / "records.json"
+    with open_sink(path, compact=True) as sink:
+        for record in records:
+            sink.write(record)
+    assert "\n" not in path.read_text()
+    assert json.loads(path.read_bytes()) == expected
+
+
+def test_jsonio_round_trip(tmp_path):
+    data = {"title": "Bodenfeuchte über Grünland", "n": [1, 2.5, None, True]}
+    assert jsonio.dumps(data, indent=True) == json.dumps(data, indent=2).encode()
+    assert jsonio.loads(jsonio.dumps(data)) == data
+    path = tmp_path / "data.json"
+    path.write_bytes(jsonio.dumps(data))
+    assert jsonio.load_path(path) == data
+
+
+def test_json_sink_writes_nothing_without_records(tmp_path):
+    path = tmp_path / "empty.json"
+    with open_sink(path):
+        pass
+    assert not path.exists()
+
+
+def test_ndjson_sink_writes_compact_lines(tmp_path):
+    path = tmp_path / "records.ndjson"
+    with open_sink(path, "ndjson") as sink:
+        sink.write(RECORDS[0])
+        sink.write(RECORDS[2])
+        # Readable while the conversion runs
+        sink._file.flush()
+        assert path.read_text().count("\n") == 2
+    lines = path.read_text().splitlines()
+    assert lines[0] == '{"citation":{"title":"A","n":[1,2]}}'
+    assert [json.loads(line) for line in lines] == [RECORDS[0], RECORDS[2]]
+
+
+def _failing(records, after):
+    for i, record in enumerate(records):
+        if i == after:
+            raise RuntimeError("mapping failed")
+        yield record
+
+
+def test_failed_conversion_leaves_unterminated_output(tmp_path):
+    path = tmp_path / "records.json"
+    with pytest.raises(RuntimeError):
+        with open_sink(path) as sink:
+            for record in _failing(RECORDS, 2):
+                sink.write(record)
+    assert path.read_text().startswith("[")
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(path.read_text())
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_failed_atomic_conversion_leaves_no_partial_output(tmp_path, output_format):
+    path = tmp_path / "records.json"
+    with pytest.raises(RuntimeError):
+        with open_sink(path, output_format, atomic=True) as sink:
+            for record in _failing(RECORDS, 2):
+                sink.write(record)
+    assert sink.count == 2
+    assert list(tmp_path.iterdir()) == []
+
+    # An earlier output is kept rather than replaced by a truncated one
+    path.write_text("[]")
+    with pytest.raises(RuntimeError):
+        with open_sink(path, output_format, atomic=True) as sink:
+            for record in _failing(RECORDS, 2):
+                sink.write(record)
+    assert list(tmp_path.iterdir()) == [path]
+    assert path.read_text() == "[]"
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_output_mode_follows_umask(tmp_path, atomic):
+    reference = tmp_path / "reference.json"
+    reference.write_text("{}")
+    path = tmp_path / "records.json"
+    with open_sink(path, atomic=atomic) as sink:
+        sink.write(RECORDS[0])
+    assert path.stat().st_mode == reference.stat().st_mode
+    assert json.loads(path.read_text()) == RECORDS[0]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        open_sink("out.xml", "xml")
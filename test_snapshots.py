@@ -0,0 +1,50 @@
+import shutil
+from pathlib import Path
+
+import yaml
+
+from to_fairagro_json.snapshots import SNAPSHOT_DIR_ENV, default_snapshot_dir, load_config
+
+FRAME = Path("config/schemaorg/frame.json")
+MAPPING = Path("config/fairagro/mapping.yaml")
+
+
+def test_snapshot_reused_until_config_changes(tmp_path, monkeypatch):
+    frame, mapping, config_hash = load_config(FRAME, MAPPING, "native", tmp_path / "snap")
+    assert mapping == yaml.safe_load(MAPPING.read_text())
+
+    def fail(_):
+        raise AssertionError("mapping parsed again")
+
+    monkeypatch.setattr(yaml, "safe_load", fail)
+    assert load_config(FRAME, MAPPING, "native", tmp_path / "snap") == (
+        frame, mapping, config_hash
+    )
+
+    monkeypatch.undo()
+    changed = tmp_path / "mapping.yaml"
+    shutil.copy(MAPPING, changed)
+    with open(changed, "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    _, remapped, changed_hash = load_config(FRAME, changed, "native", tmp_path / "snap")
+    assert changed_hash != config_hash
+    assert remapped == mapping
+
+
+def test_no_snapshot_dir(tmp_path):
+    assert load_config(FRAME, MAPPING, "pyld", None)[1] == yaml.safe_load(MAPPING.read_text())
+
+
+def test_snapshot_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(SNAPSHOT_DIR_ENV, str(tmp_path / "env"))
+    assert default_snapshot_dir() == tmp_path / "env"
+    load_config(FRAME, MAPPING, "native")
+    assert any((tmp_path / "env").iterdir())
+
+    for value in ("", "none", "OFF"):
+        monkeypatch.setenv(SNAPSHOT_DIR_ENV, value)
+        assert default_snapshot_dir() is None
+
+    monkeypatch.delenv(SNAPSHOT_DIR_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert default_snapshot_dir() == tmp_path / "xdg" / "to-fairagro-json" / "config"
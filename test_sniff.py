@@ -0,0 +1,49 @@
+import json
+import shutil
+
+import pytest
+
+from to_fairagro_json.batch import convert_directory
+from to_fairagro_json.sniff import detect_profile, load_input, sniff_profile
+
+
+@pytest.mark.parametrize("path,profile", [
+    ("data/arc-ro-crate-metadata.json", "rocrate"),
+    ("data/schemaorg/bonares-schemaorg.json", "schemaorg"),
+    ("data/schemaorg/edal-schemaorg.json", "schemaorg"),
+])
+def test_detect_profile_of_samples(path, profile):
+    assert detect_profile(path) == profile
+
+
+def test_sniff_profile():
+    assert sniff_profile(b'\xef\xbb\xbf  {"@graph": [') == "rocrate"
+    assert sniff_profile(b'{"@id": "ro-crate-metadata.json", "conformsTo"') == "rocrate"
+    assert sniff_profile(b'{"@context": "https://schema.org/", "@type": "Dataset"') == "schemaorg"
+    assert sniff_profile(b"") is None
+    assert sniff_profile(b"not json") is None
+
+
+def test_load_input_parses_once(tmp_path):
+    path = tmp_path / "notes.json"
+    path.write_text("# notes")
+    with pytest.raises(ValueError, match="Cannot detect"):
+        load_input(path)
+    profile, data = load_input("data/schemaorg/bonares-schemaorg.json")
+    assert profile == "schemaorg" and isinstance(data, list)
+
+
+def test_auto_profile_routes_mixed_directory(tmp_path):
+    root = tmp_path / "in"
+    root.mkdir()
+    shutil.copy("data/arc-ro-crate-metadata.json", root)
+    shutil.copy("data/schemaorg/bonares-schemaorg.json", root)
+    summary = convert_directory(root, tmp_path / "out", profile="auto", workers=1)
+    profiles = {r["input"].rsplit("/", 1)[-1]: r["profile"] for r in summary["results"]}
+    assert profiles == {
+        "arc-ro-crate-metadata.json": "rocrate",
+        "bonares-schemaorg.json": "schemaorg",
+    }
+    assert summary["converted"] == 2
+    output = json.loads((tmp_path / "out" / "arc-ro-crate-metadata.fairagro.json").read_text())
+    assert output["identifier"]
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from to_fairagro_json import FairagroConverter, jsonio
+from to_fairagro_json.streaming import iter_datasets
+
+THUNEN = Path("data/schemaorg/thunen-schemaorg.json")
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 4096])
+def test_array_is_read_element_by_element(read_size):
+    expected = json.loads(THUNEN.read_text())
+    assert list(iter_datasets(THUNEN, read_size=read_size)) == expected
+
+
+def test_ndjson_and_single_documents(tmp_path):
+    records = [{"a": 1}, {"b": [1, 2, {"c": "x\ny"}]}]
+    ndjson = tmp_path / "in.ndjson"
+    ndjson.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+    assert list(iter_datasets(ndjson)) == records
+
+    pretty = tmp_path / "in.json"
+    pretty.write_text(json.dumps(records[1], indent=2))
+    assert list(iter_datasets(pretty)) == [records[1]]
+
+    scalars = tmp_path / "scalars.json"
+    scalars.write_text(' [ 12345 , "a]b" ,{} , [] ]')
+    assert list(iter_datasets(scalars, read_size=2)) == [12345, "a]b", {}, []]
+
+
+def test_single_line_document_is_parsed_once(tmp_path, monkeypatch):
+    document = {"@context": "https://schema.org/", "name": "x", "n": [1, 2]}
+    path = tmp_path / "minified.json"
+    path.write_text(json.dumps(document))
+    parsed = []
+    loads = jsonio.loads
+    monkeypatch.setattr(jsonio, "loads", lambda data: parsed.append(data) or loads(data))
+    assert list(iter_datasets(path)) == [document]
+    assert len(parsed) == 1
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "[1,]", "[{]"])
+def test_malformed_arrays_raise(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_datasets(path, read_size=2))
+
+
+def test_stream_conversion_matches_sharded_conversion(tmp_path):
+    converter = FairagroConverter(profile="schemaorg")
+    expected = converter.convert_parallel(THUNEN, workers=1)
+
+    ndjson = tmp_path / "thunen.ndjson"
+    ndjson.write_text(
+        "\n".join(json.dumps(d) for d in json.loads(THUNEN.read_text()))
+    )
+    assert converter.convert_stream(THUNEN) == expected
+    assert converter.convert_stream(ndjson) == expected
+
+
+def test_stream_conversion_of_arc_document():
+    path = Path("data/arc-ro-crate-metadata.json")
+    converter = FairagroConverter(profile="rocrate")
+    converter.load(path)
+    assert converter.convert_stream(path) == converter.convert()
@@ -0,0 +1,33 @@
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.instrument import Recorder
+from to_fairagro_json.synthetic import generate_arc_crate, generate_schemaorg_array
+
+
+def convert(data, profile):
+    recorder = Recorder()
+    converter = FairagroConverter(profile=profile, observer=recorder)
+    converter.load(data)
+    return converter.convert(), recorder.counters
+
+
+def test_synthetic_crate_exercises_crops_sensors_and_authors():
+    crate = generate_arc_crate(studies=2, assays=2, samples=12, persons=3)
+    result, _ = convert(crate, "rocrate")
+    # Every (organism, pest) combination occurs once
+    assert len(result["crop"]["crop"]) == 12
+    assert result["sensor"]["sensor"][0]["sensorSensorType"] == "digital camera"
+    assert len(result["citation"]["author"]) == 3
+    assert generate_arc_crate(samples=5, seed=1) == generate_arc_crate(samples=5, seed=1)
+
+
+def test_mapping_work_grows_linearly_with_samples():
+    _, small = convert(generate_arc_crate(studies=2, assays=2, samples=50), "rocrate")
+    _, large = convert(generate_arc_crate(studies=2, assays=2, samples=200), "rocrate")
+    assert large["resolve_ref.calls"] <= 4.2 * small["resolve_ref.calls"]
+    assert large["get_literal.calls"] <= 4.2 * small["get_literal.calls"]
+
+
+def test_synthetic_schemaorg_array_maps_every_dataset():
+    result, counters = convert(generate_schemaorg_array(datasets=20), "schemaorg")
+    assert len(result) == counters["entities.framed"] == 20
+    assert all("identifier" in record for record in result)
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from to_fairagro_json import FairagroConverter
+from to_fairagro_json.validation import RecordValidator
+
+EDAL = Path("data/schemaorg/edal-schemaorg.json")
+
+
+def test_validator_reports_paths_and_messages():
+    validator = RecordValidator()
+    errors = validator.errors({"citation": {"title": 1}})
+    assert errors and all(set(e) == {"path", "message"} for e in errors)
+    assert any(e["path"].startswith("citation") for e in errors)
+    assert validator.errors(json.loads(Path("exmaple.json").read_text())) == []
+
+
+def test_converter_collects_failures_per_record(tmp_path):
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"type": "object", "required": ["missing"]}))
+
+    converter = FairagroConverter(profile="schemaorg", validate=True)
+    converter.load(EDAL)
+    records = converter.convert()
+    assert converter.validation_errors == []
+
+    converter.validator = RecordValidator(schema)
+    converter.convert_stream(EDAL, tmp_path / "out.json")
+    assert [f["record"] for f in converter.validation_errors] == [0, 1]
+    assert {f["identifier"] for f in converter.validation_errors} == {
+        r["identifier"] for r in records
+    }
+
+
+def test_workers_validate_their_shards(tmp_path):
+    converter = FairagroConverter(profile="schemaorg", validate=True)
+    count = converter.convert_parallel(
+        "data/schemaorg/thunen-schemaorg.json", tmp_path / "out.json", workers=2, chunk_size=10
+    )
+    assert count == 49
+    assert converter.validation_errors == []
@@ -1,3 +1,14 @@
-from .converter import FairagroConverter
+__all__ = ["FairagroConverter", "MappingError"]
 
-__all__ = ["FairagroConverter"]
+
+def __getattr__(name):
+    # Deferred, so importing a submodule does not load the whole converter
+    if name == "FairagroConverter":
+        from .converter import FairagroConverter
+
+        return FairagroConverter
+    if name == "MappingError":
+        from .compiler import MappingError
+
+        return MappingError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
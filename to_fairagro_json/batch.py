@@ -0,0 +1,135 @@
+import json
+import os
+import time
+from pathlib import Path
+from .converter import _get_converter, _init_worker
+from .loader import DocumentLoader
+from .sniff import AUTO_PROFILE, PROFILES, detect_profile, load_input
+
+DEFAULT_PATTERNS = ("**/*.json",)
+SUMMARY_NAME = "summary.json"
+
+def find_inputs(directory, patterns=DEFAULT_PATTERNS):
+    """Returns the files under directory matching any glob pattern, largest first."""
+    directory = Path(directory)
+    paths = {p for pattern in patterns for p in directory.glob(pattern) if p.is_file()}
+    return sorted(paths, key=lambda p: (-p.stat().st_size, str(p)))
+
+
+def output_path_for(path, input_dir, output_dir, output_format="json"):
+    """Mirrors an input file below output_dir as <stem>.fairagro.<format>."""
+    relative = Path(path).relative_to(input_dir)
+    return Path(output_dir) / relative.parent / f"{relative.stem}.fairagro.{output_format}"
+
+
+def _convert_file(task):
+    """Converts one file in a worker; failures are reported, not raised."""
+    path, output_path, converter_args, output_format, compact, atomic, stream = task
+    result = {"input": str(path), "output": str(output_path)}
+    start = time.perf_counter()
+    try:
+        (profile, *args), options = converter_args
+        data = path
+        if profile == AUTO_PROFILE:
+            # Sniffed from the bytes read for parsing, or from the head of a streamed file
+            if stream:
+                profile = detect_profile(path)
+            else:
+                profile, data = load_input(path)
+            result["profile"] = profile
+        converter = _get_converter(profile, *args, **options)
+        if stream:
+            count = converter.convert_stream(path, output_path, output_format, compact, atomic)
+        else:
+            converter.load(data)
+            output = converter.convert(output_path, output_format, compact, atomic)
+            if output is None:
+                count = 0
+            elif isinstance(output, list):
+                count = len(output)
+            else:
+                count = 1
+        result.update(status="converted", records=count)
+        if converter.fingerprints is not None:
+            result["duplicates"] = converter.duplicate_count
+        if converter.validator is not None:
+            result["invalid_records"] = len(converter.validation_errors)
+            if converter.validation_errors:
+                result["validation_errors"] = converter.validation_errors
+    except Exception as e:
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def convert_directory(
+    input_dir, output_dir, profile, target="fairagro", framer=None,
+    patterns=DEFAULT_PATTERNS, workers=None, output_format="json", stream=False,
+    result_cache=None, validate=False, compact=False, compact_graph=False,
+    dedup=None, dedup_bloom=None, atomic=False,
+):
+    """Converts every matching file below input_dir with a pool of workers.
+
+    Each worker process keeps one preloaded converter per profile for the
+    whole batch. profile="auto" picks the profile of each file from its
+    first bytes (see sniff.sniff_profile), so mixed directories need no
+    separate runs. Files are scheduled largest first; outputs mirror the input
+    tree below output_dir, next to a summary.json. With stream=True files are
+    converted per dataset, using the result cache directory if one is given.
+    With validate=True every record is checked against the FAIRagro schema in
+    the worker that produced it. compact writes unindented outputs, atomic
+    only moves each output into place once it is complete, and compact_graph
+    shares repeated structure of each framed graph (see
+    graph.compact_entities). With a dedup directory, records already written
+    from another file or an earlier run are left out (see
+    dedup.FingerprintSet; dedup_bloom bounds its memory). Returns the summary.
+    """
+    options = dict(
+        result_cache=result_cache and str(result_cache), validate=validate,
+        compact_graph=compact_graph, dedup=dedup and str(dedup), dedup_bloom=dedup_bloom,
+    )
+    converter_args = ((profile, target, framer), options)
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    # Skip earlier outputs when output_dir lies inside input_dir
+    skip = output_dir.resolve()
+    tasks = [
+        (path, output_path_for(path, input_dir, output_dir, output_format),
+         converter_args, output_format, compact, atomic, stream)
+        for path in find_inputs(input_dir, patterns)
+        if skip not in path.resolve().parents
+    ]
+
+    profiles = [converter_args]
+    if profile == AUTO_PROFILE:
+        profiles = [((p, target, framer), options) for p in PROFILES]
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = [_convert_file(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(DocumentLoader.context_config, profiles),
+        ) as executor:
+            results = list(executor.map(_convert_file, tasks))
+
+    results.sort(key=lambda r: r["input"])
+    summary = {
+        "files": len(results),
+        "converted": sum(r["status"] == "converted" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "records": sum(r.get("records", 0) for r in results),
+        "invalid_records": sum(r.get("invalid_records", 0) for r in results),
+        "duplicates": sum(r.get("duplicates", 0) for r in results),
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / SUMMARY_NAME, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
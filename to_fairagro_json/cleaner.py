@@ -1,5 +1,63 @@
 import re
 import html
+from functools import lru_cache
+
+# Normalization map, applied in a single pass over the string
+_REPLACEMENTS = {
+    "\u2013": "-",  # en-dash
+    "\u2014": "--",  # em-dash
+    "\u2018": "'",  # left single quote
+    "\u2019": "'",  # right single quote
+    "\u201c": "'",  # left double quote
+    "\u201d": "'",  # right double quote
+    "\u00a0": " ",  # non-breaking space
+    "\u00ae": "(R)",  # registered trademark
+    "\u2122": "(TM)",  # trademark
+    "\u00df": "ss",  # ß
+    "\u00e4": "ae",  # ä
+    "\u00f6": "oe",  # ö
+    "\u00fc": "ue",  # ü
+    "\u00c4": "Ae",  # Ä
+    "\u00d6": "Oe",  # Ö
+    "\u00dc": "Ue",  # Ü
+    '"': "'",  # normalize double quotes to single
+}
+_REPLACEMENT_PATTERN = re.compile("[" + "".join(_REPLACEMENTS) + "]")
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+# ASCII characters clean() would change: entities, tags, double quotes,
+# whitespace other than a single space, and runs of spaces
+_ASCII_DIRTY_PATTERN = re.compile(r'[&<"\t-\r\x1c-\x1f]|  ')
+
+# Strings up to this length are memoized (names, affiliations, keywords)
+MEMO_MAX_LENGTH = 256
+MEMO_SIZE = 8192
+
+
+def _replace(match):
+    return _REPLACEMENTS[match.group()]
+
+
+def _clean_str(s):
+    # Fast path: already-clean ASCII strings need no work at all
+    if (
+        s.isascii()
+        and not _ASCII_DIRTY_PATTERN.search(s)
+        and not s.startswith(" ")
+        and not s.endswith(" ")
+    ):
+        return s
+
+    if "&" in s:
+        s = html.unescape(s)
+    if "<" in s:
+        s = _TAG_PATTERN.sub("", s)
+    s = _REPLACEMENT_PATTERN.sub(_replace, s)
+    # Normalize whitespace (any whitespace combo becomes a single space)
+    return " ".join(s.split())
+
+
+_clean_memo = lru_cache(maxsize=MEMO_SIZE)(_clean_str)
+
 
 class StringCleaner:
     @staticmethod
@@ -10,40 +68,22 @@ class StringCleaner:
         """
         if not isinstance(s, str):
             return s
-        
-        # Unescape HTML entities
-        s = html.unescape(s)
-        # Strip HTML tags
-        s = re.sub(r'<[^>]+>', '', s)
-        
-        # Normalization map
-        replacements = {
-            '\u00e5': 'å',
-            '\u00c5': 'Å',
-            '\u201e': '„',
-            '\u00a7': '§',
-            '\u2013': '-', # en-dash
-            '\u2014': '--', # em-dash
-            '\u2018': "'", # left single quote
-            '\u2019': "'", # right single quote
-            '\u201c': "'", # left double quote
-            '\u201d': "'", # right double quote
-            '\u00a0': ' ', # non-breaking space
-            '\u00ae': '(R)', # registered trademark
-            '\u2122': '(TM)', # trademark
-            '\u00df': 'ss', # ß
-            '\u00e4': 'ae', # ä
-            '\u00f6': 'oe', # ö
-            '\u00fc': 'ue', # ü
-            '\u00c4': 'Ae', # Ä
-            '\u00d6': 'Oe', # Ö
-            '\u00dc': 'Ue', # Ü
-            '"': "'",      # normalize double quotes to single
-        }
-        
-        for old, new in replacements.items():
-            s = s.replace(old, new)
-            
-        # Normalize whitespace (replace any whitespace combo with a single space)
-        s = re.sub(r'\s+', ' ', s).strip()
-        return s
+        if len(s) <= MEMO_MAX_LENGTH:
+            return _clean_memo(s)
+        return _clean_str(s)
+
+    @classmethod
+    def clean_many(cls, values):
+        """Cleans an iterable of values, returning a list in the same order."""
+        clean = cls.clean
+        return [clean(v) for v in values]
+
+    @staticmethod
+    def cache_info():
+        """Returns hit/miss statistics of the memo for short strings."""
+        return _clean_memo.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        """Empties the memo for short strings."""
+        _clean_memo.cache_clear()
@@ -0,0 +1,38 @@
+import os
+from .loader import DocumentLoader
+from .snapshots import SNAPSHOT_DIR_ENV
+
+
+def add_context_options(parser):
+    """Adds the options for JSON-LD contexts and config snapshots to a parser."""
+    parser.add_argument(
+        "--context-cache",
+        help="Directory for a persistent cache of remote JSON-LD contexts",
+    )
+    parser.add_argument(
+        "--contexts",
+        help="Directory of bundled JSON-LD contexts (with a contexts.json manifest)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Never fetch remote contexts; fail fast if one is not bundled or cached",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Directory for snapshots of the parsed frame and mapping (defaults to "
+        f"${SNAPSHOT_DIR_ENV}, else ~/.cache/to-fairagro-json/config); none disables them",
+    )
+
+
+def apply_context_options(args):
+    """Applies the options of add_context_options before converters are created."""
+    if args.snapshot_dir is not None:
+        # Read wherever a converter is created, worker processes included
+        os.environ[SNAPSHOT_DIR_ENV] = args.snapshot_dir
+    if args.context_cache or args.contexts or args.offline:
+        DocumentLoader.configure_contexts(
+            cache_dir=args.context_cache,
+            preload_dir=args.contexts,
+            offline=args.offline,
+        )
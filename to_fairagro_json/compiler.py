@@ -0,0 +1,202 @@
+FIELD_TYPES = ("string", "string_array", "complex_list", "complex")
+
+GEO_FIELDS = frozenset(
+    ["westLongitude", "eastLongitude", "northLatitude", "southLatitude"]
+)
+
+# Citation fields whose values are assembled by dedicated mapper logic
+CITATION_HANDLERS = frozenset(
+    ["author", "alternativeTitle", "datasetContact", "dsDescription", "otherId"]
+)
+
+# Blocks whose values come from graph-wide extractors instead of the entity
+EXTRACTOR_BLOCKS = frozenset(["crop", "sensor"])
+
+# Fields that must exist in a block even if the mapping produced nothing
+MANDATORY_FALLBACKS = {
+    "citation": {
+        "dsDescription": [{"dsDescriptionValue": "No description available"}],
+        "otherId": [{"otherIdValue": "Unknown", "otherIdAgency": "Other"}],
+    }
+}
+
+
+class MappingError(ValueError):
+    """Raised when a mapping profile cannot be compiled."""
+
+
+def compile_path(path):
+    """Splits a dot-notation source path once. ``@`` (the value itself) becomes None."""
+    if path == "@":
+        return None
+    return tuple(path.split("."))
+
+
+class SubFieldPlan:
+    """A compiled entry of a field's ``mapping`` section."""
+
+    def __init__(
+        self, name, sources, placeholder, paths, wrap, nested=None, simple=False
+    ):
+        self.name = name
+        self.sources = sources
+        self.placeholder = placeholder
+        self.paths = paths
+        self.wrap = wrap
+        # Sub-plans of a nested complex object (e.g. sensorIsHostedBy)
+        self.nested = nested
+        # True for plain source lists (``name: ["path", ...]``)
+        self.simple = simple
+
+
+class FieldPlan:
+    """A compiled field: its extractor (source paths, default) and formatter settings."""
+
+    def __init__(self, name, cfg, handler=None):
+        self.name = name
+        self.cfg = cfg
+        self.handler = handler
+        self.type = cfg.get("type", "string")
+        self.wrap = bool(cfg.get("wrap"))
+
+        sources = cfg.get("source")
+        self.paths = _compile_sources(name, sources) if "source" in cfg else None
+        self.has_default = "default" in cfg
+        self.default = cfg.get("default")
+
+        mapping = cfg.get("mapping")
+        self.has_mapping = bool(mapping)
+        self.subfields = _compile_subfields(name, mapping) if mapping else []
+        # Names filled from the item itself when a complex_list item is a literal
+        self.literal_targets = [
+            sub.name for sub in self.subfields if "@" in sub.sources
+        ]
+
+        mapping_str = str(cfg.get("mapping", {}))
+        self.geo = name in GEO_FIELDS or "_geo_" in mapping_str
+        # Bounding box sides mapped with wrap: true
+        self.geo_wrap = frozenset(
+            geo_name for geo_name in GEO_FIELDS
+            if self.geo and isinstance(mapping, dict)
+            and isinstance(mapping.get(geo_name), dict) and mapping[geo_name].get("wrap")
+        )
+
+
+class BlockPlan:
+    """A compiled block: its fields, optional extractor and mandatory fallbacks."""
+
+    def __init__(self, name, fields, extractor=None, fallbacks=None):
+        self.name = name
+        self.fields = fields
+        self.extractor = extractor
+        self.fallbacks = fallbacks or {}
+
+
+class MappingPlan:
+    """The compiled form of a mapping profile, shared by every mapped entity."""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+
+def _compile_sources(name, sources):
+    if not isinstance(sources, list) or not all(isinstance(s, str) for s in sources):
+        raise MappingError(f"Field '{name}': 'source' must be a list of strings")
+    return [compile_path(s) for s in sources]
+
+
+def _compile_subfields(name, mapping):
+    if not isinstance(mapping, dict):
+        raise MappingError(f"Field '{name}': 'mapping' must be a mapping")
+
+    subfields = []
+    for sub_name, sub_cfg in mapping.items():
+        where = f"{name}.{sub_name}"
+        if isinstance(sub_cfg, list):
+            sources = sub_cfg
+            paths = _compile_sources(where, sources)
+            subfields.append(
+                SubFieldPlan(sub_name, sources, None, paths, False, simple=True)
+            )
+            continue
+        if not isinstance(sub_cfg, dict):
+            raise MappingError(f"Field '{where}': expected a source list or mapping")
+
+        sources = sub_cfg.get("source", [])
+        paths = _compile_sources(where, sources)
+        placeholder = sources[0] if sources and sources[0].startswith("_") else None
+        nested = None
+        if sub_cfg.get("type") == "complex" and "mapping" in sub_cfg:
+            nested = _compile_subfields(where, sub_cfg["mapping"])
+            for n_sub in nested:
+                if n_sub.nested is not None:
+                    raise MappingError(
+                        f"Field '{where}.{n_sub.name}': complex objects nest one level only"
+                    )
+        subfields.append(
+            SubFieldPlan(
+                sub_name, sources, placeholder, paths, bool(sub_cfg.get("wrap")), nested
+            )
+        )
+    return subfields
+
+
+def compile_field(name, cfg, block_name=None):
+    """Compiles a single field configuration into a FieldPlan."""
+    if not isinstance(cfg, dict):
+        raise MappingError(f"Field '{name}': configuration must be a mapping")
+    ftype = cfg.get("type", "string")
+    if ftype not in FIELD_TYPES:
+        raise MappingError(
+            f"Field '{name}': unknown type '{ftype}' (expected one of {', '.join(FIELD_TYPES)})"
+        )
+    handler = None
+    if block_name == "citation" and name in CITATION_HANDLERS:
+        handler = name
+    return FieldPlan(name, cfg, handler)
+
+
+def compile_mapping(mapping):
+    """Compiles a parsed mapping profile (``mapping.yaml``) into a MappingPlan.
+
+    Raises MappingError for malformed profiles so problems surface once, before
+    any entity is mapped.
+    """
+    if not isinstance(mapping, dict):
+        raise MappingError("Mapping profile must be a mapping")
+    blocks_cfg = mapping.get("blocks", {})
+    if not isinstance(blocks_cfg, dict):
+        raise MappingError("'blocks' must be a mapping of block names")
+
+    blocks = []
+    for block_name, block_cfg in blocks_cfg.items():
+        if not isinstance(block_cfg, dict):
+            raise MappingError(f"Block '{block_name}': configuration must be a mapping")
+        fields_cfg = block_cfg.get("fields", [])
+        if not isinstance(fields_cfg, list):
+            raise MappingError(f"Block '{block_name}': 'fields' must be a list")
+
+        fields = []
+        for field_cfg in fields_cfg:
+            if not isinstance(field_cfg, dict) or len(field_cfg) != 1:
+                raise MappingError(
+                    f"Block '{block_name}': each field must be a single-key mapping"
+                )
+            field_name, cfg = next(iter(field_cfg.items()))
+            fields.append(compile_field(field_name, cfg, block_name))
+
+        extractor = None
+        if block_name in EXTRACTOR_BLOCKS:
+            if not fields or fields[0].name != block_name:
+                raise MappingError(
+                    f"Block '{block_name}': first field must be '{block_name}'"
+                )
+            extractor = block_name
+            fields = fields[:1]
+
+        blocks.append(
+            BlockPlan(
+                block_name, fields, extractor, MANDATORY_FALLBACKS.get(block_name)
+            )
+        )
+    return MappingPlan(blocks)
@@ -0,0 +1,153 @@
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from .diskcache import DEFAULT_MAX_BYTES, DiskCache, content_hash
+from .locks import locked_open
+
+MANIFEST_NAME = "contexts.json"
+DEFAULT_TIMEOUT = 10
+ACCEPT = "application/ld+json, application/json"
+_JSON_TYPE = re.compile(r"application/(\w*\+)?json")
+
+
+class ContextUnavailableError(LookupError):
+    """Raised in offline mode when a context is neither bundled nor cached."""
+
+
+class ContextStore:
+    """Local store of remote JSON-LD context documents.
+
+    Documents are kept in memory and, if ``cache_dir`` is given, in a
+    content-addressed DiskCache (blobs keyed by the SHA-256 of their bytes,
+    plus a URL index). In offline mode a miss raises ContextUnavailableError
+    immediately instead of going to the network.
+    """
+
+    def __init__(
+        self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, offline=False,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.offline = offline
+        self.timeout = timeout
+        self._documents = {}
+        self._lock = threading.Lock()
+
+        self.blobs = None
+        self._index_path = None
+        self._index = {}
+        if cache_dir:
+            cache_dir = Path(cache_dir)
+            self.blobs = DiskCache(cache_dir / "objects", max_bytes=max_bytes)
+            self._index_path = cache_dir / "urls.json"
+            if self._index_path.exists():
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+
+    def preload(self, directory):
+        """Loads bundled contexts from a directory.
+
+        The directory holds a ``contexts.json`` manifest mapping context URLs to
+        file names relative to the directory. Returns the number of contexts loaded.
+        """
+        directory = Path(directory)
+        manifest = directory / MANIFEST_NAME
+        if not manifest.exists():
+            raise FileNotFoundError(f"Context manifest not found: {manifest}")
+        with open(manifest, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        for url, filename in entries.items():
+            with open(directory / filename, "r", encoding="utf-8") as f:
+                self._documents[url] = json.load(f)
+        return len(entries)
+
+    def add(self, url, document):
+        """Registers a document for a URL, persisting it if a cache_dir is set."""
+        with self._lock:
+            self._documents[url] = document
+            if self.blobs is None:
+                return
+            data = json.dumps(document, sort_keys=True).encode("utf-8")
+            key = content_hash(data)
+            self.blobs.put(key, data)
+            if self._index.get(url) != key:
+                self._index[url] = key
+                self._write_index(url, key)
+
+    def _write_index(self, url, key):
+        """Adds an entry to the URL index on disk.
+
+        Other processes may have added entries since the index was read, so it
+        is re-read and merged under a lock, then replaced by a private file.
+        """
+        with locked_open(self._index_path.with_name("urls.lock"), "a"):
+            if self._index_path.exists():
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index.update(json.load(f))
+            self._index[url] = key
+            fd, tmp = tempfile.mkstemp(dir=self._index_path.parent, prefix=".urls-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._index, f)
+                os.replace(tmp, self._index_path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def get(self, url):
+        """Returns the cached document for a URL, or None."""
+        document = self._documents.get(url)
+        if document is not None or self.blobs is None:
+            return document
+        key = self._index.get(url)
+        if key is None:
+            return None
+        data = self.blobs.get(key)
+        if data is None:
+            # Evicted; the URL entry is stale
+            return None
+        document = json.loads(data)
+        self._documents[url] = document
+        return document
+
+    def load(self, url):
+        """Returns the document for a URL, fetching and caching it when online."""
+        document = self.get(url)
+        if document is not None:
+            return document
+        if self.offline:
+            raise ContextUnavailableError(f"Context not available offline: {url}")
+
+        document = fetch(url, self.timeout)
+        self.add(url, document)
+        return document
+
+
+def fetch(url, timeout=DEFAULT_TIMEOUT):
+    """Fetches a JSON-LD document over HTTP(S) with the standard library.
+
+    A response that is not JSON may link its JSON-LD version with a
+    rel="alternate" Link header (as schema.org does), which is followed once.
+    """
+    # Imported on first use; most runs never fetch a context
+    import urllib.parse
+    import urllib.request
+
+    if urllib.parse.urlsplit(url).scheme not in ("http", "https"):
+        raise ValueError(f"Only http and https contexts can be fetched: {url}")
+    request = urllib.request.Request(url, headers={"Accept": ACCEPT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        content_type = response.headers.get_content_type()
+        link = response.headers.get("Link")
+        if link and not _JSON_TYPE.fullmatch(content_type):
+            from pyld import jsonld
+
+            alternate = jsonld.parse_link_header(link).get("alternate")
+            if isinstance(alternate, dict) and alternate.get("type") == "application/ld+json":
+                alternate_url = urllib.parse.urljoin(response.url, alternate["target"])
+                request = urllib.request.Request(alternate_url, headers={"Accept": ACCEPT})
+                with urllib.request.urlopen(request, timeout=timeout) as linked:
+                    return json.loads(linked.read())
+        return json.loads(response.read())
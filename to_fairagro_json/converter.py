@@ -1,15 +1,74 @@
-import json
-import yaml
+import os
+from functools import partial
+from itertools import chain
 from pathlib import Path
+from .compiler import compile_mapping
+from .dedup import FingerprintSet, record_fingerprint
+from .diskcache import DEFAULT_MAX_BYTES
+from .graph import compact_entities
+from .instrument import timed
 from .loader import DocumentLoader
 from .mapper import MetadataMapper
+from .results import ResultCache
+from .sinks import open_sink
+from .snapshots import DEFAULT_SNAPSHOT_DIR, load_config
+from .streaming import iter_datasets
+
+# Framing engine per input profile; "native" falls back to pyld on its own
+PROFILE_FRAMERS = {"schemaorg": "native", "rocrate": "native"}
+
+# Datasets sent to a worker process per task in convert_parallel
+DEFAULT_CHUNK_SIZE = 16
+
+# Converters of a worker process, keyed by their arguments
+_converters = {}
+
+
+def _get_converter(profile, target="fairagro", framer=None, **options):
+    """Returns the process's converter for these arguments, built on first use."""
+    key = (profile, target, framer, *sorted(options.items()))
+    if key not in _converters:
+        _converters[key] = FairagroConverter(
+            profile=profile, target=target, framer=framer, **options
+        )
+    return _converters[key]
+
+
+def _init_worker(context_config, converters):
+    """Sets up a worker process with the context store and converters it will use.
+
+    converters holds the (args, options) of each converter to build up front
+    (see _get_converter), so no task waits for its setup.
+    """
+    if context_config is not None:
+        DocumentLoader.configure_contexts(**context_config)
+    for args, options in converters:
+        _get_converter(*args, **options)
+
+
+def _convert_shard(converter_args, datasets):
+    """Returns a shard's records and, if validating, the errors of each record."""
+    args, options = converter_args
+    converter = _get_converter(*args, **options)
+    records = converter.convert_datasets(datasets)
+    validator = converter.validator
+    errors = [validator.errors(r) for r in records] if validator else None
+    return records, errors
 
 
 class FairagroConverter:
-    def __init__(self, profile="schemaorg", target="fairagro"):
+    def __init__(
+        self, profile="schemaorg", target="fairagro", framer=None,
+        result_cache=None, result_cache_bytes=DEFAULT_MAX_BYTES, observer=None,
+        validate=False, snapshot_dir=DEFAULT_SNAPSHOT_DIR, compact_graph=False,
+        dedup=None, dedup_bloom=None,
+    ):
         base_path = Path(__file__).parent.parent
+        # Receives stage times and counters (see instrument.Observer)
+        self.observer = observer
         self.profile = profile
         self.target = target
+        self.framer = framer or PROFILE_FRAMERS.get(profile, "pyld")
 
         self.config_dir = base_path / "config"
         self.frame_path = self.config_dir / profile / "frame.json"
@@ -21,17 +80,71 @@ class FairagroConverter:
         if not self.mapping_path.exists():
             raise FileNotFoundError(f"Mapping not found: {self.mapping_path}")
 
-        with open(self.frame_path, "r", encoding="utf-8") as f:
-            self.frame = json.load(f)
-        with open(self.mapping_path, "r", encoding="utf-8") as f:
-            self.mapping = yaml.safe_load(f)
+        # Parsed configs come from a snapshot while the files are unchanged
+        self.frame, self.mapping, self.config_hash = load_config(
+            self.frame_path, self.mapping_path, self.framer, snapshot_dir
+        )
+        # Compile once; every mapper created by this converter reuses the plan
+        self.plan = compile_mapping(self.mapping)
+
+        # Per-dataset results of iter_records, reused while the config is unchanged
+        self.result_cache = None
+        if result_cache:
+            self.result_cache = ResultCache(
+                result_cache, self.config_hash, max_bytes=result_cache_bytes
+            )
+
+        # Schema checks of every produced record (see validation_errors)
+        self.validator = None
+        if validate:
+            # jsonschema is only imported when validating
+            from .validation import RecordValidator
+
+            self.validator = RecordValidator()
+        self.validation_errors = []
+        self._validated_count = 0
 
+        # Records already produced, in this run or earlier ones (see dedup.FingerprintSet)
+        self.fingerprints = None
+        if dedup:
+            self.fingerprints = FingerprintSet(dedup, bloom_capacity=dedup_bloom)
+        # Records dropped as duplicates by the last conversion
+        self.duplicate_count = 0
+
+        # Share repeated structure of framed graphs (see graph.compact_entities)
+        self.compact_graph = compact_graph
+        # Author records shared by all mappers of this converter, across datasets
+        self.person_cache = {}
         self.entities = []
-        self.mapper = MetadataMapper(self.mapping, all_entities=self.entities)
+        self.mapper = MetadataMapper(
+            self.mapping, all_entities=self.entities, plan=self.plan,
+            observer=observer, person_cache=self.person_cache,
+        )
+
+    def _worker_kwargs(self):
+        """Arguments for an equivalent converter in a worker process."""
+        kwargs = {
+            "validate": self.validator is not None,
+            "compact_graph": self.compact_graph,
+        }
+        if self.result_cache is not None:
+            kwargs["result_cache"] = self.result_cache.blobs.root
+            kwargs["result_cache_bytes"] = self.result_cache.blobs.max_bytes
+        return kwargs
 
     def load(self, data):
         """Loads and frames the input data using DocumentLoader."""
-        self.entities = DocumentLoader.frame_data(data, self.frame)
+        entities = DocumentLoader.frame_data(
+            data, self.frame, engine=self.framer, observer=self.observer
+        )
+        if self.compact_graph:
+            with timed(self.observer, "compact_graph"):
+                entities = compact_entities(entities)
+        self.use_entities(entities)
+
+    def use_entities(self, entities):
+        """Selects the datasets to convert from already framed entities."""
+        self.entities = entities
         self.mapper.all_entities = self.entities
 
         # Filter only Datasets
@@ -45,7 +158,7 @@ class FairagroConverter:
 
         # Prioritize Investigation over Study/Assay
         def get_rank(e):
-            atype = e.get("additionalType", [])
+            atype = e.get("additionalType") or []
             if isinstance(atype, str):
                 atype = [atype]
             if "Investigation" in atype:
@@ -58,11 +171,43 @@ class FairagroConverter:
 
         self.entities.sort(key=get_rank)
 
-    def convert(self, output_path=None):
+    def convert(self, output_path=None, output_format="json", compact=False, atomic=False):
         """Orchestrates the conversion of all entities to FAIRagro Core Spec.
 
         - If the input has an ARC Investigation hierarchy, outputs a single JSON object.
         - If the input is a flat list of independent datasets, outputs a JSON array.
+
+        output_format selects the file layout (see sinks.OUTPUT_FORMATS),
+        compact drops its indentation, and atomic only moves the output to
+        output_path once it is complete (see sinks.Sink). A converter created with a dedup
+        directory leaves out records produced before (see _deduplicated).
+        """
+        self._reset_counts()
+        records = self._validated(self._deduplicated(self._iter_mapped()))
+        if not output_path:
+            return self._write(records, None)
+        # Records reach the sink as they are mapped, and are kept for the return value
+        output_results = []
+        self._write(
+            self._kept(records, output_results), output_path, output_format, compact, atomic
+        )
+        return self._collect(output_results)
+
+    @staticmethod
+    def _kept(records, kept):
+        for record in records:
+            kept.append(record)
+            yield record
+
+    def _map_loaded(self):
+        """Maps the loaded entities, returning the output records."""
+        return list(self._iter_mapped())
+
+    def _iter_mapped(self):
+        """Maps the loaded entities, yielding each output record once it is mapped.
+
+        Each map_entity call is reported as a stage of its own, so time spent
+        by consumers between records is not counted.
         """
         # Check if any entity is ARC-typed (Investigation/Study/Assay)
         has_arc_hierarchy = any(
@@ -70,33 +215,210 @@ class FairagroConverter:
             for e in self.entities
             for atype in ["Investigation", "Study", "Assay"]
         )
-
-        output_results = []
         if has_arc_hierarchy:
             # For ARC inputs: only map the primary entity (Investigation or first)
-            primary = self.entities[0]
-            blocks = self.mapper.map_entity(primary)
-            if blocks:
-                output_results.append(blocks)
+            pairs = [(self.mapper, self.entities[0])]
         else:
-            # For flat inputs (Schema.org arrays): map each entity independently
-            for entity in self.entities:
-                # Give mapper a single-entity view so extraction is scoped to this dataset
-                single_mapper = MetadataMapper(self.mapping, all_entities=[entity])
-                blocks = single_mapper.map_entity(entity)
-                if blocks:
-                    output_results.append(blocks)
+            pairs = self._flat_mappers()
+
+        mapped = 0
+        for mapper, entity in pairs:
+            with timed(self.observer, "map_entity"):
+                blocks = mapper.map_entity(entity)
+            if blocks:
+                mapped += 1
+                yield blocks
+        if self.observer is not None:
+            self.observer.count("records.mapped", mapped)
 
+    def _flat_mappers(self):
+        """Yields (mapper, entity) per loaded entity (flat Schema.org arrays)."""
+        for entity in self.entities:
+            # Give mapper a single-entity view so extraction is scoped to this dataset
+            single_mapper = MetadataMapper(
+                self.mapping, all_entities=[entity], plan=self.plan,
+                observer=self.observer, person_cache=self.person_cache,
+            )
+            yield single_mapper, entity
+
+    @staticmethod
+    def _collect(output_results):
         if not output_results:
             return None
-
         # Return array for multiple independent datasets, single object for ARC
-        final_output = output_results[0] if len(output_results) == 1 else output_results
+        return output_results[0] if len(output_results) == 1 else output_results
+
+    def _reset_counts(self):
+        self.validation_errors = []
+        self._validated_count = 0
+        self.duplicate_count = 0
+        if self.fingerprints is not None:
+            # Claims of a conversion that was never finished
+            self.fingerprints.discard()
+
+    def _is_duplicate(self, record):
+        with timed(self.observer, "dedup"):
+            duplicate = not self.fingerprints.claim(record_fingerprint(record))
+        if duplicate:
+            self.duplicate_count += 1
+            if self.observer is not None:
+                self.observer.count("records.duplicates")
+        return duplicate
+
+    def _deduplicated(self, records):
+        """Drops records produced before, by DOI or else by content.
+
+        Duplicates are dropped before validation and serialization and
+        counted in duplicate_count. The fingerprints of the records kept are
+        only stored once they are written (see _write). Without a fingerprint
+        set (see the dedup argument) records pass through unchanged.
+        """
+        if self.fingerprints is None:
+            return records
+        return (record for record in records if not self._is_duplicate(record))
+
+    def _shard_records(self, records, errors):
+        """Deduplicates and validates a shard converted by a worker process."""
+        if self.fingerprints is not None:
+            kept = [i for i, record in enumerate(records) if not self._is_duplicate(record)]
+            records = [records[i] for i in kept]
+            if errors is not None:
+                errors = [errors[i] for i in kept]
+        return self._validated(records, errors)
+
+    def _validated(self, records, known_errors=None):
+        """Passes records through, collecting schema failures in validation_errors.
+
+        Each failure is recorded as {"record", "identifier", "errors"}, where
+        record is the position in the output. known_errors holds the errors of
+        each record if they were already computed (e.g. in a worker process).
+        """
+        if self.validator is None and known_errors is None:
+            yield from records
+            return
+        for i, record in enumerate(records):
+            errors = known_errors[i] if known_errors is not None else None
+            if errors is None:
+                with timed(self.observer, "validate"):
+                    errors = self.validator.errors(record)
+            if errors:
+                self.validation_errors.append({
+                    "record": self._validated_count,
+                    "identifier": record.get("identifier"),
+                    "errors": errors,
+                })
+            self._validated_count += 1
+            yield record
+
+    def _write(self, records, output_path, output_format="json", compact=False, atomic=False):
+        """Passes records to an output sink as they are produced.
+
+        Without an output_path the records are collected and returned as by
+        convert(); otherwise the number of records written is returned. If
+        producing a record fails, the output is left unfinished (or, if atomic,
+        not written at all; see sinks.Sink), and the records are not
+        remembered as produced (see _deduplicated).
+        """
+        sink = open_sink(output_path, output_format, compact, atomic) if output_path else None
+        try:
+            if sink is None:
+                records = list(records)
+            else:
+                for record in records:
+                    with timed(self.observer, "serialize"):
+                        sink.write(record)
+                with timed(self.observer, "serialize"):
+                    sink.close()
+        except BaseException:
+            # Leaves no partial output behind (nor replaces an earlier one)
+            if sink is not None:
+                sink.abort()
+            if self.fingerprints is not None:
+                self.fingerprints.discard()
+            raise
+        if self.fingerprints is not None:
+            self.fingerprints.commit()
+        return self._collect(records) if sink is None else sink.count
+
+    def iter_records(self, datasets):
+        """Frames and maps each dataset of a flat input on its own.
+
+        datasets may be any iterable; each one is released once it is mapped.
+        Yields the mapped records in input order. With a result cache, datasets
+        seen before under the same config skip framing and mapping.
+        """
+        cache = self.result_cache
+        for dataset in datasets:
+            if cache is None:
+                self.load(dataset)
+                yield from self._iter_mapped()
+                continue
+            key = cache.key(dataset)
+            records = cache.get(key)
+            if self.observer is not None:
+                hit = "hits" if records is not None else "misses"
+                self.observer.count(f"result_cache.{hit}")
+            if records is None:
+                self.load(dataset)
+                records = self._map_loaded()
+                cache.put(key, records)
+            yield from records
+
+    def convert_datasets(self, datasets):
+        """Returns the records of iter_records as a list."""
+        return list(self.iter_records(datasets))
+
+    def convert_stream(
+        self, source, output_path=None, output_format="json", compact=False, atomic=False,
+    ):
+        """Converts an input one dataset at a time (see iter_datasets).
+
+        Top-level JSON arrays and NDJSON files are never loaded whole, and each
+        record is written as soon as it is mapped, so peak memory follows the
+        largest dataset rather than the file. As with convert_parallel, records
+        follow the input order. Returns as _write does.
+        """
+        self._reset_counts()
+        records = self._validated(self._deduplicated(self.iter_records(iter_datasets(source))))
+        return self._write(records, output_path, output_format, compact, atomic)
+
+    def convert_parallel(
+        self, data, output_path=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+        output_format="json", compact=False, atomic=False,
+    ):
+        """Converts a flat Schema.org array in per-dataset shards across processes.
+
+        Each array element is framed and mapped independently, so nodes shared
+        between elements are not merged, and records follow the input order
+        rather than the framed @id order of convert(). Chunks of chunk_size
+        datasets are sent to a pool of ``workers`` processes (default: all cores).
+        Inputs that are not a top-level array are converted sequentially.
+        Shards are written as they complete, and validated by the workers;
+        returns as _write does.
+        """
+        self._reset_counts()
+        data = DocumentLoader.load_json(data)
+        if not isinstance(data, list):
+            self.load(data)
+            records = self._validated(self._deduplicated(self._iter_mapped()))
+            return self._write(records, output_path, output_format, compact, atomic)
+
+        from concurrent.futures import ProcessPoolExecutor
 
-        if output_path:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(final_output, f, indent=2)
+        workers = workers or os.cpu_count() or 1
+        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+        if workers == 1 or len(chunks) <= 1:
+            records = self._validated(self._deduplicated(self.iter_records(data)))
+            return self._write(records, output_path, output_format, compact, atomic)
 
-        return final_output
+        converter_args = ((self.profile, self.target, self.framer), self._worker_kwargs())
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(DocumentLoader.context_config, [converter_args]),
+        ) as executor:
+            shards = executor.map(partial(_convert_shard, converter_args), chunks)
+            records = chain.from_iterable(
+                self._shard_records(records, errors) for records, errors in shards
+            )
+            return self._write(records, output_path, output_format, compact, atomic)
@@ -0,0 +1,210 @@
+import hashlib
+import math
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from .locks import locked_open
+from .results import canonical_json
+
+# Leading bytes of a SHA-256 digest kept per record
+FINGERPRINT_BYTES = 16
+# Overwrites a rolled back entry; no record hashes to it in practice
+_BLANK = bytes(FINGERPRINT_BYTES)
+DEFAULT_ERROR_RATE = 0.001
+
+# A value that is a DOI as a whole, bare or behind a resolver
+_DOI_PATTERN = re.compile(
+    r"(?:https?://(?:dx\.)?doi\.org/|doi:)?(10\.\d{4,9}/\S+)", re.IGNORECASE
+)
+
+
+def normalize_doi(value):
+    """Returns the lowercased DOI a value consists of, or None."""
+    if not isinstance(value, str):
+        return None
+    match = _DOI_PATTERN.fullmatch(value.strip())
+    return match.group(1).lower() if match else None
+
+
+def record_key(record):
+    """Returns the DOI identifying a mapped record, or None if it has none.
+
+    The record identifier is tried first, then the otherId values. Other
+    identifiers are not used, as sources reuse them across datasets (e.g.
+    "Unknown" or an internal template name), and neither is free text that
+    merely mentions a DOI.
+    """
+    candidates = [record.get("identifier")]
+    other_ids = record.get("citation", {}).get("otherId")
+    if isinstance(other_ids, list):
+        candidates.extend(o.get("otherIdValue") for o in other_ids if isinstance(o, dict))
+    for value in candidates:
+        doi = normalize_doi(value)
+        if doi is not None:
+            return doi
+    return None
+
+
+def record_fingerprint(record):
+    """Returns the fingerprint of a record: its DOI, else its canonical content."""
+    doi = record_key(record)
+    text = f"doi:{doi}" if doi is not None else f"record:{canonical_json(record)}"
+    return hashlib.sha256(text.encode("utf-8")).digest()[:FINGERPRINT_BYTES]
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over fingerprints (uniformly random bytes)."""
+
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / max(1, capacity) * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fingerprint):
+        # Double hashing from two halves of the digest
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, fingerprint):
+        bits = self.bits
+        for pos in self._positions(fingerprint):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, fingerprint):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fingerprint))
+
+
+class FingerprintSet:
+    """A persistent set of record fingerprints, shared by runs and processes.
+
+    Fingerprints are appended to one of 256 shard files under root, picked
+    by their first byte. Each instance indexes the shards it touches: in a
+    set by default, or in a Bloom filter sized for bloom_capacity entries,
+    which bounds memory and confirms its hits against the shard file.
+
+    A conversion claim()s the fingerprint of each record it produces. Shards
+    are checked and appended to under an exclusive lock, so concurrent
+    processes never both claim the same fingerprint. Once the output is
+    written the claims are commit()ted; if the conversion fails, discard()
+    rolls them back, so its records are produced again by a later one.
+    Rolled back entries are blanked in the shard and listed in a removals
+    file, from which other instances drop them from their index.
+    """
+
+    def __init__(self, root, bloom_capacity=None, error_rate=DEFAULT_ERROR_RATE):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.exact = not bloom_capacity
+        self.index = set() if self.exact else BloomFilter(bloom_capacity, error_rate)
+        # Fingerprints claimed by the running conversion
+        self.pending = set()
+        # Bytes of each shard file (and of its removals) already in the index
+        self._offsets = {}
+        self._removed = {}
+
+    def claim(self, fingerprint):
+        """Claims a fingerprint; returns False if the set already held it."""
+        shard = fingerprint[0]
+        with self._locked(shard) as f:
+            if self._held(f, fingerprint):
+                return False
+            f.write(fingerprint)
+            self._offsets[shard] += FINGERPRINT_BYTES
+        self.index.add(fingerprint)
+        self.pending.add(fingerprint)
+        return True
+
+    def commit(self):
+        """Keeps the claimed fingerprints for good."""
+        self.pending.clear()
+
+    def discard(self):
+        """Rolls back the claimed fingerprints, leaving them to a later conversion."""
+        shards = {}
+        for fingerprint in self.pending:
+            shards.setdefault(fingerprint[0], []).append(fingerprint)
+        for shard, fingerprints in sorted(shards.items()):
+            with self._locked(shard) as f, open(self._path(shard), "r+b") as entries:
+                for fingerprint in fingerprints:
+                    pos = self._find(f, fingerprint)
+                    if pos is not None:
+                        entries.seek(pos)
+                        entries.write(_BLANK)
+                    if self.exact:
+                        self.index.discard(fingerprint)
+                with open(self._path(shard, "rm"), "ab") as removed:
+                    removed.write(b"".join(fingerprints))
+                    self._removed[shard] = removed.tell()
+        self.pending.clear()
+
+    def add(self, fingerprint):
+        """Stores a fingerprint at once; returns False if the set already held it."""
+        if not self.claim(fingerprint):
+            return False
+        self.pending.discard(fingerprint)
+        return True
+
+    def _path(self, shard, suffix="fp"):
+        return self.root / f"{shard:02x}.{suffix}"
+
+    @contextmanager
+    def _locked(self, shard):
+        """Opens a shard file, holding an exclusive lock until it is closed."""
+        with locked_open(self._path(shard)) as f:
+            self._catch_up(f, shard)
+            yield f
+
+    def _catch_up(self, f, shard):
+        """Indexes the entries appended to a shard by other processes."""
+        offset = self._offsets.get(shard, 0)
+        f.seek(offset)
+        tail = f.read()
+        end = len(tail) - len(tail) % FINGERPRINT_BYTES
+        for i in range(0, end, FINGERPRINT_BYTES):
+            entry = tail[i:i + FINGERPRINT_BYTES]
+            if entry != _BLANK:
+                self.index.add(entry)
+        offset += end
+        if end != len(tail):
+            # A partial entry left by an interrupted write
+            f.truncate(offset)
+        self._offsets[shard] = offset
+        if self.exact:
+            # A Bloom filter cannot drop entries, but confirms its hits anyway
+            self._catch_up_removals(f, shard)
+
+    def _catch_up_removals(self, f, shard):
+        """Drops the fingerprints other processes rolled back from the index."""
+        offset = self._removed.get(shard, 0)
+        try:
+            with open(self._path(shard, "rm"), "rb") as removed:
+                removed.seek(offset)
+                tail = removed.read()
+        except FileNotFoundError:
+            return
+        end = len(tail) - len(tail) % FINGERPRINT_BYTES
+        for i in range(0, end, FINGERPRINT_BYTES):
+            fingerprint = tail[i:i + FINGERPRINT_BYTES]
+            # Claimed again since it was rolled back
+            if fingerprint in self.index and self._find(f, fingerprint) is None:
+                self.index.discard(fingerprint)
+        self._removed[shard] = offset + end
+
+    def _held(self, f, fingerprint):
+        return fingerprint in self.index and (
+            self.exact or self._find(f, fingerprint) is not None
+        )
+
+    @staticmethod
+    def _find(f, fingerprint):
+        """Returns the position of fingerprint among a shard's entries, or None."""
+        f.seek(0)
+        data = f.read()
+        pos = data.find(fingerprint)
+        while pos != -1:
+            if pos % FINGERPRINT_BYTES == 0:
+                return pos
+            pos = data.find(fingerprint, pos + 1)
+        return None
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Share of max_bytes eviction frees the store down to, so it rarely scans it
+LOW_WATER_MARK = 0.9
+
+
+def content_hash(data):
+    """Returns the hex SHA-256 digest of bytes (or UTF-8 encoded text)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    """A size-bounded on-disk blob store with least-recently-used eviction.
+
+    Blobs are stored under ``<root>/<key[:2]>/<key>``, where keys are hex
+    digests. Reads refresh a blob's mtime, and once the total size exceeds
+    ``max_bytes`` the blobs with the oldest mtime are removed first, down to
+    LOW_WATER_MARK of it. The total size is only scanned for on the first
+    write (or size lookup), so opening a store and reading from it is cheap.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Total size of the blobs, None until it is needed
+        self._size = None
+
+    def _path(self, key):
+        return self.root / key[:2] / key
+
+    def _entries(self):
+        """Yields (path, size, mtime) for every stored blob."""
+        for sub in self.root.iterdir():
+            if not sub.is_dir():
+                continue
+            for path in sub.iterdir():
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    @property
+    def size(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def __contains__(self, key):
+        return self._path(key).exists()
+
+    def get(self, key):
+        """Returns the blob stored under key, or None if it is missing."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        """Stores a blob atomically and evicts old blobs if over the size bound."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        size = self.size
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self._size = size + len(data) - previous
+        if self._size > self.max_bytes:
+            self.evict(keep=path)
+
+    def delete(self, key):
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def evict(self, keep=None):
+        """Removes least-recently-used blobs until the store fits LOW_WATER_MARK."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        self._size = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * LOW_WATER_MARK)
+        for path, size, _ in entries:
+            if self._size <= target:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def clear(self):
+        for path, _, _ in list(self._entries()):
+            path.unlink(missing_ok=True)
+        self._size = 0
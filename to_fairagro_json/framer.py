@@ -0,0 +1,622 @@
+"""Native JSON-LD framing for the subset of JSON-LD the bundled profiles use.
+
+pyld expands and frames documents with the full JSON-LD algorithms, which is
+slow on large inputs (an ARC RO-Crate has thousands of nodes). The schema.org
+and RO-Crate frames only need simple contexts, type matching, property
+selection and nested embedding, so NativeFramer implements exactly that and
+produces the same framed document as ``DocumentLoader``'s pyld pipeline
+(expand, normalize_schema, ``jsonld.frame`` with ``@once`` embedding, null
+defaults and pruned blank node identifiers).
+
+Inputs or frames outside that subset raise UnsupportedFeature, so callers can
+fall back to pyld.
+"""
+import json
+import re
+from functools import partial
+
+# Resolves relative IRIs as the installed pyld does, set up with the first one
+_resolve_iri = None
+
+KEYWORDS = frozenset([
+    "@base", "@container", "@context", "@default", "@direction", "@embed",
+    "@explicit", "@first", "@graph", "@id", "@import", "@included", "@index",
+    "@json", "@language", "@list", "@nest", "@none", "@omitDefault", "@prefix",
+    "@preserve", "@protected", "@requireAll", "@reverse", "@set", "@type",
+    "@value", "@version", "@vocab", "@propagate",
+])
+
+_ABSOLUTE_IRI = re.compile(r"^([A-Za-z][A-Za-z0-9+-.]*|_):[^\s]*$")
+_KEYWORD_LIKE = re.compile(r"^@[a-zA-Z]+$")
+_GEN_DELIMS = ":/?#[]@"
+
+
+class UnsupportedFeature(ValueError):
+    """Raised when an input or frame uses JSON-LD the native framer does not handle."""
+
+
+def _normalize(value):
+    """Same rewrite as DocumentLoader.normalize_schema, for a single string."""
+    if "http://schema.org/" in value:
+        return value.replace("http://schema.org/", "https://schema.org/")
+    return value
+
+
+def _resolve(value):
+    global _resolve_iri
+    if _resolve_iri is None:
+        try:
+            from pyld.iri_resolver import resolve
+            from pyld.jsonld import DEFAULT_BASE_IRI
+        except ImportError:
+            # pyld 2 expands without a base IRI, keeping relative IRIs as written
+            _resolve_iri = str
+        else:
+            _resolve_iri = partial(resolve, base_iri=DEFAULT_BASE_IRI)
+    return _resolve_iri(value)
+
+
+class _Context:
+    """An active context limited to @vocab, @language and simple term definitions."""
+
+    __slots__ = ("key", "vocab", "language", "terms", "prefixes", "_inverse", "_cache")
+
+    def __init__(self, key="", vocab=None, language=None, terms=None, prefixes=None):
+        self.key = key
+        self.vocab = vocab
+        self.language = language
+        # term -> IRI (None for terms explicitly mapped to null)
+        self.terms = terms or {}
+        # terms usable as compact IRI prefixes
+        self.prefixes = prefixes or {}
+        self._inverse = None
+        self._cache = {}
+
+    def copy(self, key):
+        return _Context(
+            key, self.vocab, self.language, dict(self.terms), dict(self.prefixes)
+        )
+
+    # -- expansion ---------------------------------------------------------
+
+    def _expand_prefixed(self, value):
+        """Expands ``prefix:suffix`` values; returns None if value has no prefix."""
+        colon = value.find(":")
+        if colon <= 0:
+            return None
+        prefix, suffix = value[:colon], value[colon + 1:]
+        if prefix == "_" or suffix.startswith("//"):
+            return value
+        if prefix in self.prefixes:
+            return self.prefixes[prefix] + suffix
+        if _ABSOLUTE_IRI.match(value):
+            return value
+        return None
+
+    def expand_key(self, key):
+        """Expands a property key; returns None for keys JSON-LD drops."""
+        cached = self._cache.get(("k", key), False)
+        if cached is not False:
+            return cached
+        if key in KEYWORDS:
+            iri = key
+        elif _KEYWORD_LIKE.match(key):
+            iri = None
+        elif key in self.terms:
+            iri = self.terms[key]
+        else:
+            iri = self._expand_prefixed(key)
+            if iri is None and self.vocab is not None:
+                iri = self.vocab + key
+        if iri is not None and iri not in KEYWORDS and not _ABSOLUTE_IRI.match(iri):
+            iri = None
+        self._cache[("k", key)] = iri
+        return iri
+
+    def expand_type(self, value):
+        cached = self._cache.get(("t", value))
+        if cached is not None:
+            return cached
+        if value in KEYWORDS or _KEYWORD_LIKE.match(value) or value.startswith("_:"):
+            raise UnsupportedFeature(f"Unsupported @type value: {value}")
+        if value in self.terms:
+            iri = self.terms[value]
+            if iri is None:
+                raise UnsupportedFeature(f"@type {value} is mapped to null")
+        else:
+            iri = self._expand_prefixed(value)
+            if iri is None:
+                iri = self.vocab + value if self.vocab is not None else _resolve(value)
+        self._cache[("t", value)] = iri
+        return iri
+
+    def expand_id(self, value):
+        if value in KEYWORDS or _KEYWORD_LIKE.match(value):
+            raise UnsupportedFeature(f"Unsupported @id value: {value}")
+        iri = self._expand_prefixed(value)
+        return iri if iri is not None else _resolve(value)
+
+    # -- compaction --------------------------------------------------------
+
+    def compact_vocab(self, iri):
+        """Compacts a property or type IRI (term, @vocab suffix, CURIE)."""
+        cached = self._cache.get(("v", iri))
+        if cached is not None:
+            return cached
+        if self._inverse is None:
+            self._inverse = {}
+            for term in sorted(self.terms, key=lambda t: (len(t), t)):
+                if self.terms[term]:
+                    self._inverse.setdefault(self.terms[term], term)
+        compacted = self._inverse.get(iri)
+        if compacted is None and self.vocab is not None:
+            if iri.startswith(self.vocab) and iri != self.vocab:
+                suffix = iri[len(self.vocab):]
+                if suffix not in self.terms:
+                    compacted = suffix
+        if compacted is None:
+            compacted = self._compact_curie(iri)
+        self._cache[("v", iri)] = compacted
+        return compacted
+
+    def compact_id(self, iri):
+        cached = self._cache.get(("i", iri))
+        if cached is None:
+            cached = self._cache[("i", iri)] = self._compact_curie(iri)
+        return cached
+
+    def _compact_curie(self, iri):
+        candidate = None
+        for term, term_iri in self.terms.items():
+            if not term_iri or term_iri == iri or not iri.startswith(term_iri):
+                continue
+            curie = term + ":" + iri[len(term_iri):]
+            if term not in self.prefixes or curie in self.terms:
+                continue
+            if candidate is None or (len(curie), curie) < (len(candidate), candidate):
+                candidate = curie
+        if candidate is not None:
+            return candidate
+        for term in self.prefixes:
+            if iri.startswith(term + ":"):
+                raise UnsupportedFeature(f"IRI {iri} is confused with prefix {term}")
+        return iri
+
+
+class _Node:
+    """A node of the merged node map."""
+
+    __slots__ = ("id", "types", "props", "seen")
+
+    def __init__(self, node_id):
+        self.id = node_id
+        self.types = []
+        # IRI -> values; a value is a node id (str) or a (value, language) tuple
+        self.props = {}
+        # IRI -> key of the value already present (JSON-LD value equality), or
+        # the set of keys once there are several
+        self.seen = {}
+
+    def add(self, iri, value, key):
+        seen = self.seen.get(iri)
+        if seen is None:
+            self.seen[iri] = key
+            self.props[iri] = [value]
+            return
+        if type(seen) is not set:
+            if key is seen or key == seen:
+                return
+            seen = self.seen[iri] = {seen}
+        elif key in seen:
+            return
+        seen.add(key)
+        self.props[iri].append(value)
+
+
+class _Frame:
+    """A compiled (sub)frame: type constraint and property subframes."""
+
+    __slots__ = ("types", "any_type", "props")
+
+    def __init__(self, types=None, any_type=False, props=None):
+        # Frozenset of type IRIs for a specific @type, else None
+        self.types = types
+        # True for ``"@type": {}`` (matches nodes with any type)
+        self.any_type = any_type
+        self.props = props or {}
+
+    def matches(self, node):
+        if self.types is not None:
+            return any(t in self.types for t in node.types)
+        if self.any_type and node.types:
+            return True
+        for iri in self.props:
+            if iri in node.props:
+                return True
+        return not self.any_type and not self.props
+
+    @property
+    def accepts_values(self):
+        # Value objects only match frames without @type/@value/@language
+        return self.types is None and not self.any_type
+
+
+# Frame used for properties the frame does not mention: embed everything
+_IMPLICIT_FRAME = _Frame()
+
+
+class NativeFramer:
+    """Frames compact schema.org / RO-Crate JSON without going through pyld.
+
+    ``document_loader`` is a pyld-style loader (``url -> {"document": ...}``)
+    used for remote contexts. A framer instance caches processed contexts, so
+    reuse it for documents that share contexts.
+    """
+
+    def __init__(self, frame, document_loader):
+        self.document_loader = document_loader
+        self._contexts = {}
+        self._context_count = 0
+
+        if not isinstance(frame, dict):
+            raise UnsupportedFeature("Frame must be an object")
+        self.frame_context = frame.get("@context", {})
+        self._frame_ctx = self._process_context(_Context(), self.frame_context)
+        if self._frame_ctx.language is not None:
+            raise UnsupportedFeature("Frame contexts with @language are not supported")
+        self._frame = self._compile_frame(self._frame_ctx, frame, top=True)
+
+    # -- contexts ----------------------------------------------------------
+
+    def _process_context(self, active, local):
+        cache_key = (active.key, json.dumps(local, sort_keys=True))
+        ctx = self._contexts.get(cache_key)
+        if ctx is not None:
+            return ctx
+
+        ctx = active
+        for item in local if isinstance(local, list) else [local]:
+            if item is None:
+                ctx = _Context()
+            elif isinstance(item, str):
+                ctx = self._process_context(ctx, self._load_context(item))
+            elif isinstance(item, dict):
+                ctx = self._apply_context(ctx, item)
+            else:
+                raise UnsupportedFeature("Invalid @context value")
+        self._contexts[cache_key] = ctx
+        return ctx
+
+    def _load_context(self, url):
+        if not _ABSOLUTE_IRI.match(url):
+            raise UnsupportedFeature(f"Relative context URL: {url}")
+        try:
+            document = self.document_loader(url, {})["document"]
+            if isinstance(document, str):
+                document = json.loads(document)
+        except Exception as e:
+            raise UnsupportedFeature(f"Context {url} could not be loaded: {e}") from e
+        if not isinstance(document, dict):
+            raise UnsupportedFeature(f"Context {url} is not a JSON object")
+        return document.get("@context", {})
+
+    def _apply_context(self, active, local):
+        self._context_count += 1
+        ctx = active.copy(f"{active.key}/{self._context_count}")
+
+        for key in local:
+            if key.startswith("@") and key not in ("@vocab", "@language"):
+                if key in KEYWORDS:
+                    raise UnsupportedFeature(f"Unsupported context keyword: {key}")
+
+        if "@vocab" in local:
+            vocab = local["@vocab"]
+            if vocab is None:
+                ctx.vocab = None
+            elif isinstance(vocab, str) and vocab not in ctx.terms:
+                ctx.vocab = ctx._expand_prefixed(vocab)
+                if ctx.vocab is None:
+                    raise UnsupportedFeature(f"Relative @vocab: {vocab}")
+            else:
+                raise UnsupportedFeature("Unsupported @vocab value")
+        if "@language" in local:
+            language = local["@language"]
+            if language is not None and not isinstance(language, str):
+                raise UnsupportedFeature("Invalid @language value")
+            ctx.language = language.lower() if language else None
+
+        defined = {}
+        for term in local:
+            if not term.startswith("@"):
+                self._define_term(ctx, local, term, defined)
+        return ctx
+
+    def _define_term(self, ctx, local, term, defined):
+        if term in defined:
+            if defined[term]:
+                return
+            raise UnsupportedFeature(f"Cyclic term definition: {term}")
+        defined[term] = False
+
+        if ":" in term or "/" in term:
+            raise UnsupportedFeature(f"Compact IRI or IRI terms are not supported: {term}")
+        value = local[term]
+        ctx.terms.pop(term, None)
+        ctx.prefixes.pop(term, None)
+
+        if value is None:
+            ctx.terms[term] = None
+        elif not isinstance(value, str):
+            raise UnsupportedFeature(f"Expanded term definition for {term}")
+        elif value.startswith("@"):
+            raise UnsupportedFeature(f"Keyword alias or reserved value for {term}")
+        elif value == term:
+            if ctx.vocab is None:
+                raise UnsupportedFeature(f"Term {term} needs an @vocab")
+            ctx.terms[term] = ctx.vocab + term
+        else:
+            iri = self._expand_term_value(ctx, local, value, defined)
+            if iri is None or not _ABSOLUTE_IRI.match(iri):
+                raise UnsupportedFeature(f"Term {term} does not map to an absolute IRI")
+            ctx.terms[term] = iri
+            if iri.startswith("_:") or iri[-1] in _GEN_DELIMS:
+                ctx.prefixes[term] = iri
+        defined[term] = True
+
+    def _expand_term_value(self, ctx, local, value, defined):
+        if value in local and defined.get(value) is not True:
+            self._define_term(ctx, local, value, defined)
+        if value in ctx.terms:
+            return ctx.terms[value]
+        colon = value.find(":")
+        if colon > 0:
+            prefix = value[:colon]
+            if prefix in local and not defined.get(prefix):
+                self._define_term(ctx, local, prefix, defined)
+            iri = ctx._expand_prefixed(value)
+            if iri is not None:
+                return iri
+        if ctx.vocab is not None:
+            return ctx.vocab + value
+        return None
+
+    # -- frame -------------------------------------------------------------
+
+    def _compile_frame(self, ctx, frame, top=False):
+        types, any_type, props = None, False, {}
+        for key, value in frame.items():
+            if key == "@context" and top:
+                continue
+            iri = ctx.expand_key(key)
+            if iri is None:
+                continue
+            if iri == "@type":
+                if value == {}:
+                    any_type = True
+                    continue
+                values = value if isinstance(value, list) else [value]
+                if not values or not all(isinstance(v, str) for v in values):
+                    raise UnsupportedFeature("Unsupported @type in frame")
+                types = frozenset(ctx.expand_type(v) for v in values)
+            elif iri in KEYWORDS:
+                raise UnsupportedFeature(f"Unsupported frame keyword: {key}")
+            elif not isinstance(value, dict) or iri in props:
+                raise UnsupportedFeature(f"Unsupported frame value for {key}")
+            else:
+                props[iri] = self._compile_frame(ctx, value)
+        return _Frame(types, any_type, props)
+
+    # -- expansion ---------------------------------------------------------
+
+    def _expand_document(self, data):
+        """Yields the input's top-level nodes as (id, types, props) tuples.
+
+        Nodes are expanded one at a time, so only the node being merged into
+        the node map is held in expanded form.
+        """
+        ctx = _Context()
+        if isinstance(data, dict) and "@graph" in data:
+            if any(k not in ("@context", "@graph") for k in data):
+                raise UnsupportedFeature("Named graphs are not supported")
+            if "@context" in data:
+                ctx = self._process_context(ctx, data["@context"])
+            data = data["@graph"]
+
+        for item in data if isinstance(data, list) else [data]:
+            yield from self._expand_top(ctx, item)
+
+    def _expand_top(self, ctx, item):
+        if isinstance(item, list):
+            for i in item:
+                yield from self._expand_top(ctx, i)
+        elif isinstance(item, dict):
+            node = self._expand_node(ctx, item)
+            node_id, types, props = node
+            count = (node_id is not None) + (types is not None) + len(props)
+            # Free-floating top-level objects are dropped by expansion
+            if count and not (count == 1 and node_id is not None):
+                yield node
+
+    def _expand_node(self, ctx, obj):
+        if "@context" in obj:
+            ctx = self._process_context(ctx, obj["@context"])
+
+        node_id, types, props, sources = None, None, {}, {}
+        for key in sorted(obj):
+            if key == "@context":
+                continue
+            iri = ctx.expand_key(key)
+            if iri is None:
+                continue
+            value = obj[key]
+            if iri == "@id":
+                if not isinstance(value, str):
+                    raise UnsupportedFeature("@id must be a string")
+                node_id = _normalize(ctx.expand_id(value))
+            elif iri == "@type":
+                values = value if isinstance(value, list) else [value]
+                if not all(isinstance(v, str) for v in values):
+                    raise UnsupportedFeature("@type must be a string or a list of strings")
+                if values:
+                    types = [_normalize(ctx.expand_type(v)) for v in values]
+            elif iri in KEYWORDS:
+                raise UnsupportedFeature(f"Unsupported keyword: {iri}")
+            elif value is not None:
+                normalized = _normalize(iri)
+                # normalize_schema would let one key overwrite the other
+                if sources.setdefault(normalized, iri) != iri:
+                    raise UnsupportedFeature(f"Keys collide after normalization: {iri}")
+                values = props.get(normalized)
+                if values is None:
+                    values = props[normalized] = []
+                self._expand_value(ctx, value, values)
+        return node_id, types, props
+
+    def _expand_value(self, ctx, value, out):
+        if value is None:
+            return
+        if isinstance(value, list):
+            for item in value:
+                self._expand_value(ctx, item, out)
+        elif isinstance(value, dict):
+            out.append(self._expand_node(ctx, value))
+        elif isinstance(value, str):
+            value = _normalize(value)
+            if value == "@null":
+                raise UnsupportedFeature("'@null' string values are not supported")
+            out.append((value, ctx.language))
+        elif isinstance(value, (bool, int, float)):
+            out.append((value, None))
+        else:
+            raise UnsupportedFeature(f"Unsupported value: {value!r}")
+
+    # -- node map ----------------------------------------------------------
+
+    def _build_node_map(self, expanded):
+        self._nodes = {}
+        self._bnode_labels = {}
+        self._bnode_count = 0
+        for node in expanded:
+            self._add_node(node)
+        # Value keys are only needed while merging
+        for node in self._nodes.values():
+            node.seen = None
+
+    def _issue(self, label=None):
+        """Issues blank node identifiers in the same order as pyld (``_:b0``, ...)."""
+        if label is not None and label in self._bnode_labels:
+            return self._bnode_labels[label]
+        issued = f"_:b{self._bnode_count}"
+        self._bnode_count += 1
+        if label is not None:
+            self._bnode_labels[label] = issued
+        return issued
+
+    def _add_node(self, expanded, subject=None, prop=None):
+        node_id, types, props = expanded
+        if node_id is None:
+            node_id = self._issue()
+        elif node_id.startswith("_:"):
+            node_id = self._issue(node_id)
+
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = self._nodes[node_id] = _Node(node_id)
+        else:
+            # Every reference shares the id string of the node
+            node_id = node.id
+        if subject is not None:
+            subject.add(prop, node_id, node_id)
+
+        if types:
+            for t in types:
+                if t not in node.types:
+                    node.types.append(t)
+        for iri in sorted(props):
+            if iri.startswith("_:"):
+                raise UnsupportedFeature("Blank node properties are not supported")
+            for value in props[iri]:
+                # Values are (value, language) pairs, nested nodes are triples
+                if len(value) == 2:
+                    v, language = value
+                    node.add(iri, value, (v, language, type(v) is bool))
+                else:
+                    self._add_node(value, node, iri)
+
+    # -- framing -----------------------------------------------------------
+
+    def frame(self, data):
+        """Frames a parsed JSON-LD document; returns the same shape as jsonld.frame."""
+        self._build_node_map(self._expand_document(data))
+
+        self._bnode_outputs = {}
+        outputs = []
+        for node_id in sorted(self._nodes):
+            node = self._nodes[node_id]
+            if self._frame.matches(node):
+                # Each top-level match is framed as its own @once compartment
+                outputs.append(self._embed(node, self._frame, {node_id}))
+
+        # Prune blank node identifiers that are only used once
+        for bnode_outputs in self._bnode_outputs.values():
+            if len(bnode_outputs) == 1:
+                del bnode_outputs[0]["@id"]
+
+        contexts = [
+            c for c in (
+                self.frame_context if isinstance(self.frame_context, list)
+                else [self.frame_context]
+            )
+            if not (isinstance(c, dict) and not c)
+        ]
+        framed = {}
+        if contexts:
+            framed["@context"] = contexts[0] if len(contexts) == 1 else contexts
+        if len(outputs) == 1:
+            framed.update(outputs[0])
+        elif outputs:
+            framed["@graph"] = outputs
+        return framed
+
+    def _output(self, node_id):
+        output = {"@id": self._frame_ctx.compact_id(node_id)}
+        if node_id.startswith("_:"):
+            self._bnode_outputs.setdefault(node_id, []).append(output)
+        return output
+
+    def _embed(self, node, frame, embedded):
+        ctx = self._frame_ctx
+        output = self._output(node.id)
+        if node.types:
+            types = [ctx.compact_vocab(t) for t in node.types]
+            output["@type"] = types[0] if len(types) == 1 else types
+
+        values = {}
+        for iri in sorted(node.props):
+            subframe = frame.props.get(iri, _IMPLICIT_FRAME)
+            items = []
+            for value in node.props[iri]:
+                if isinstance(value, str):
+                    target = self._nodes[value]
+                    if not subframe.matches(target):
+                        continue
+                    if value in embedded:
+                        items.append(self._output(value))
+                    else:
+                        embedded.add(value)
+                        items.append(self._embed(target, subframe, embedded))
+                elif subframe.accepts_values:
+                    v, language = value
+                    items.append(
+                        v if language is None else {"@language": language, "@value": v}
+                    )
+            if items:
+                values[iri] = items[0] if len(items) == 1 else items
+
+        # Frame properties the node has no (matching) values for default to null
+        for iri in frame.props:
+            values.setdefault(iri, None)
+
+        for iri in sorted(values):
+            output[ctx.compact_vocab(iri)] = values[iri]
+        return output
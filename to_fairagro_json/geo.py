@@ -0,0 +1,156 @@
+import math
+import re
+from array import array
+
+# Schema.org GeoShape properties holding "lat lon lat lon ..." coordinate lists
+SHAPE_PROPERTIES = ("box", "polygon", "line")
+# Coordinate lists of at least this many numbers are parsed with NumPy, if installed
+NUMPY_MIN_VALUES = 1024
+
+_NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+")
+# Characters of plain decimal number lists, which split() tokenizes like the pattern
+_PLAIN_CHARS = b"0123456789.+-, \t\n\r"
+
+# The numpy module once imported, False if it is not installed
+_numpy = None
+
+
+def _np():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy
+
+
+def parse_coordinates(text):
+    """Parses the numbers of a coordinate string into a flat numeric array.
+
+    Returns an array('d') of alternating latitudes and longitudes, or a
+    float64 NumPy array for long lists (polygons of whole regions) when NumPy
+    is installed. Separators are free-form: spaces, commas or both.
+    """
+    if text.isascii() and not text.encode("ascii").translate(None, _PLAIN_CHARS):
+        tokens = text.replace(",", " ").split()
+        try:
+            return _to_array(tokens)
+        except ValueError:
+            # Numbers run together ("1-2") or stray signs and dots
+            pass
+    return _to_array(_NUMBER_PATTERN.findall(text))
+
+
+def _to_array(tokens):
+    np = _np() if len(tokens) >= NUMPY_MIN_VALUES else False
+    if np:
+        return np.array(tokens, dtype=np.float64)
+    return array("d", map(float, tokens))
+
+
+def bounding_box(coords):
+    """Returns the bounding box of a flat lat/lon array, or {} if it has no pair.
+
+    A trailing unpaired number is ignored.
+    """
+    end = len(coords) - len(coords) % 2
+    if end < 2:
+        return {}
+    lats = coords[0:end:2]
+    lons = coords[1:end:2]
+    if type(coords) is array:
+        west, east, north, south = min(lons), max(lons), max(lats), min(lats)
+    else:
+        west, east, north, south = lons.min(), lons.max(), lats.max(), lats.min()
+    return {
+        "westLongitude": float(west),
+        "eastLongitude": float(east),
+        "northLatitude": float(north),
+        "southLatitude": float(south),
+    }
+
+
+def shape_bounds(value, resolve=None):
+    """Returns the bounding box around every shape in a spatial value.
+
+    value may be a coordinate string (a box, polygon or line), a GeoShape
+    with box, polygon and line properties, GeoCoordinates with latitude and
+    longitude, a Place with geo, a JSON-LD value object, or a list of any of
+    these. Strings of fewer than two points are ignored, as are values
+    without coordinates; {} is returned if nothing is left. resolve, if
+    given, maps each node to the node it references (see _resolve_ref).
+    """
+    parts = []
+    _collect(value, parts, resolve)
+    if not parts:
+        return {}
+    if len(parts) == 1:
+        return bounding_box(parts[0])
+    np = _np() if any(type(p) is not array for p in parts) else False
+    if np:
+        return bounding_box(np.concatenate(parts))
+    coords = array("d")
+    for part in parts:
+        coords.extend(part)
+    return bounding_box(coords)
+
+
+def _collect(value, parts, resolve):
+    """Appends the coordinate arrays found in value to parts."""
+    if resolve is not None and isinstance(value, dict):
+        value = resolve(value)
+    if isinstance(value, str):
+        coords = parse_coordinates(value)
+        if len(coords) >= 4:
+            parts.append(coords)
+    elif isinstance(value, list):
+        if value and all(_is_number(v) for v in value):
+            # A coordinate list given as numbers rather than as a string
+            if len(value) >= 4:
+                parts.append(array("d", map(float, value)))
+            return
+        for item in value:
+            _collect(item, parts, resolve)
+    elif isinstance(value, dict):
+        if "@value" in value:
+            _collect(value["@value"], parts, resolve)
+            return
+        for prop in SHAPE_PROPERTIES:
+            shape = value.get(prop)
+            if shape:
+                _collect(shape, parts, resolve)
+        point = _point(value)
+        if point is not None:
+            parts.append(point)
+        if value.get("geo"):
+            _collect(value["geo"], parts, resolve)
+
+
+def _point(node):
+    """Returns the (lat, lon) array of a GeoCoordinates node, or None."""
+    lat = _number(node.get("latitude"))
+    lon = _number(node.get("longitude"))
+    if lat is None or lon is None:
+        return None
+    return array("d", (lat, lon))
+
+
+def _number(value):
+    if isinstance(value, list) and value:
+        value = value[0]
+    if isinstance(value, dict):
+        value = value.get("@value")
+    if not (_is_number(value) or isinstance(value, str)):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _is_number(value):
+    # bool is an int, but never a coordinate
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
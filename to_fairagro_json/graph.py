@@ -0,0 +1,44 @@
+def compact_entities(entities):
+    """Returns the framed entities with repeated structure shared.
+
+    Equal keys and string values are made one object, and structurally
+    identical dicts and lists (e.g. a Person or Organization embedded under
+    many datasets, or the same PropertyValue in every process) are replaced
+    by a single shared object, bottom-up. Nodes stay plain dicts and lists, so mappers
+    read the compacted graph exactly as the framed one; neither may be
+    modified afterwards, as a change would show up wherever a node is shared.
+    """
+    # A local table rather than sys.intern, which keeps its table for good
+    strings = {}
+    intern = strings.setdefault
+    shared = {}
+
+    def visit(value):
+        t = type(value)
+        if t is str:
+            return intern(value, value)
+        if t is dict:
+            items = [(intern(k, k), visit(v)) for k, v in value.items()]
+            key = (dict, *((k, _identity(v)) for k, v in items))
+        elif t is list:
+            items = [visit(v) for v in value]
+            key = (list, *map(_identity, items))
+        else:
+            return value
+        node = shared.get(key)
+        if node is None:
+            node = shared[key] = t(items)
+        return node
+
+    return [visit(entity) for entity in entities]
+
+
+def _identity(value):
+    """Hashable stand-in for a value whose children are already shared."""
+    t = type(value)
+    if t is str:
+        return value
+    if t is dict or t is list:
+        return id(value)
+    # Keeps 1, 1.0 and True apart
+    return (t, value)
@@ -0,0 +1,86 @@
+import time
+from contextlib import contextmanager
+
+
+class Observer:
+    """Receives instrumentation events from the converter.
+
+    Subclass and override the events of interest. ``stage`` reports the wall
+    time of one pass through a pipeline stage, ``count`` increments a named
+    counter. Converters, DocumentLoader.frame_data and MetadataMapper accept
+    an observer and emit nothing (at no cost) without one.
+    """
+
+    def stage(self, name, seconds):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+
+class Recorder(Observer):
+    """Observer that accumulates stage times and counters for a report."""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    def stage(self, name, seconds):
+        total, calls = self.stages.get(name, (0.0, 0))
+        self.stages[name] = (total + seconds, calls + 1)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        return {
+            "stages": {
+                name: {"seconds": round(total, 6), "calls": calls}
+                for name, (total, calls) in self.stages.items()
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+@contextmanager
+def timed(observer, name):
+    """Reports the time spent in the block as a stage, if there is an observer."""
+    if observer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observer.stage(name, time.perf_counter() - start)
+
+
+def instrument_mapper(mapper, observer):
+    """Counts reference resolution, literal extraction and cleaning on a mapper.
+
+    The counting wrappers are installed as instance attributes, so mappers
+    without an observer run the plain methods.
+    """
+    resolve_ref = mapper._resolve_ref
+    get_literal = mapper._get_literal
+    clean = mapper.cleaner.clean
+
+    def _resolve_ref(ref):
+        observer.count("resolve_ref.calls")
+        if isinstance(ref, dict):
+            ref_id = ref.get("@id")
+            if isinstance(ref_id, str) and ref_id not in mapper._node_index:
+                observer.count("resolve_ref.misses")
+        return resolve_ref(ref)
+
+    def _get_literal(v):
+        observer.count("get_literal.calls")
+        return get_literal(v)
+
+    def _clean(s):
+        observer.count("cleaner.calls")
+        return clean(s)
+
+    mapper._resolve_ref = _resolve_ref
+    mapper._get_literal = _get_literal
+    mapper.cleaner.clean = _clean
@@ -0,0 +1,50 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Name of the backend used by loads/dumps: "orjson" when installed, else "json"
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Reused stdlib encoders; json.dumps builds a new one per call for non-default options
+_compact_encoder = json.JSONEncoder(separators=(",", ":"))
+_pretty_encoder = json.JSONEncoder(indent=2)
+
+
+def loads(data):
+    """Parses JSON from str or bytes with the fastest available backend."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some inputs the stdlib accepts (NaN, lone surrogates)
+            pass
+    return json.loads(data)
+
+
+def load_path(path):
+    """Reads and parses a JSON file, without decoding it to str first."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dumps(data, indent=False):
+    """Serializes data to UTF-8 bytes.
+
+    Compact output (the default) has no whitespace. indent=True matches
+    json.dumps(data, indent=2) byte for byte and always uses the stdlib, as
+    the default output format is defined by it. orjson writes non-ASCII
+    characters unescaped, so compact bytes differ between the backends while
+    decoding to the same data.
+    """
+    if indent:
+        return _pretty_encoder.encode(data).encode("utf-8")
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # Values orjson cannot represent, e.g. integers beyond 64 bits
+            pass
+    return _compact_encoder.encode(data).encode("utf-8")
@@ -1,17 +1,58 @@
-import json
+import copy
 from pathlib import Path
-from pyld import jsonld
+from .contexts import ContextStore, ContextUnavailableError
+from .framer import NativeFramer, UnsupportedFeature
+from .instrument import timed
+from .jsonio import load_path
+
+_HTTP_SCHEMA = "http://schema.org/"
+_HTTPS_SCHEMA = "https://schema.org/"
+
+# "native" uses NativeFramer and falls back to pyld for unsupported JSON-LD
+FRAMING_ENGINES = ("native", "pyld")
+
+
+def _unavailable_context(error):
+    """Returns the ContextUnavailableError an error was caused by, if any."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, ContextUnavailableError):
+            return error
+        seen.add(id(error))
+        # pyld wraps loader errors in a JsonLdError with a cause
+        error = getattr(error, "cause", None) or error.__cause__ or error.__context__
+    return None
+
 
 class DocumentLoader:
+    # Remote contexts are resolved through this store (see configure_contexts)
+    context_store = ContextStore()
+    # Arguments of the last configure_contexts call, replayed in worker processes
+    context_config = None
+
     @staticmethod
     def load_json(data):
         if isinstance(data, (str, Path)):
-            with open(data, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_path(data)
         return data
 
-    @staticmethod
-    def custom_document_loader(url, options={}):
+    @classmethod
+    def configure_contexts(cls, cache_dir=None, preload_dir=None, offline=False, **kwargs):
+        """Replaces the context store, e.g. with a persistent or offline one.
+
+        Extra keyword arguments (max_bytes, timeout) are passed to ContextStore.
+        """
+        store = ContextStore(cache_dir=cache_dir, offline=offline, **kwargs)
+        if preload_dir:
+            store.preload(preload_dir)
+        cls.context_store = store
+        cls.context_config = dict(
+            cache_dir=cache_dir, preload_dir=preload_dir, offline=offline, **kwargs
+        )
+        return store
+
+    @classmethod
+    def custom_document_loader(cls, url, options={}):
         """Handles common contexts offline or using local fallbacks."""
         standard_ctx = {
             "@context": {
@@ -26,43 +67,118 @@ class DocumentLoader:
                 'documentUrl': url,
                 'document': standard_ctx
             }
-        return jsonld.get_document_loader()(url)
+        return {
+            'contextUrl': None,
+            'documentUrl': url,
+            'document': cls.context_store.load(url)
+        }
 
     @staticmethod
     def normalize_schema(obj):
-        """Ensures consistent https usage for schema.org terms."""
-        if isinstance(obj, list):
-            return [DocumentLoader.normalize_schema(i) for i in obj]
-        if isinstance(obj, dict):
-            new_obj = {}
-            for k, v in obj.items():
-                new_k = k.replace("http://schema.org/", "https://schema.org/")
-                new_obj[new_k] = DocumentLoader.normalize_schema(v)
-            return new_obj
+        """Ensures consistent https usage for schema.org terms.
+
+        Lists and dicts are rewritten in place in a single iterative walk, and
+        only strings and keys containing the http prefix are touched. Returns
+        the normalized object (the same container that was passed in).
+        """
         if isinstance(obj, str):
-            return obj.replace("http://schema.org/", "https://schema.org/")
+            return obj.replace(_HTTP_SCHEMA, _HTTPS_SCHEMA) if _HTTP_SCHEMA in obj else obj
+        if not isinstance(obj, (list, dict)):
+            return obj
+
+        http, https = _HTTP_SCHEMA, _HTTPS_SCHEMA
+        stack = [obj]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            if isinstance(node, list):
+                for i in range(len(node)):
+                    v = node[i]
+                    t = type(v)
+                    if t is str:
+                        if http in v:
+                            node[i] = v.replace(http, https)
+                    elif t is dict or t is list:
+                        push(v)
+            else:
+                if http in "\0".join(node):
+                    # Rebuild so renamed keys keep their position (a later
+                    # duplicate after renaming wins, as with a fresh dict)
+                    items = list(node.items())
+                    node.clear()
+                    for k, v in items:
+                        node[k.replace(http, https)] = v
+                for k, v in node.items():
+                    t = type(v)
+                    if t is str:
+                        if http in v:
+                            node[k] = v.replace(http, https)
+                    elif t is dict or t is list:
+                        push(v)
         return obj
 
     @classmethod
-    def frame_data(cls, data, frame):
-        """Expands, normalizes, and frames the input data."""
-        data = cls.load_json(data)
-        
-        try:
-            expanded = jsonld.expand(data, options={'documentLoader': cls.custom_document_loader})
-        except Exception:
-            # Fallback for inaccessible contexts
-            if isinstance(data, list): expanded = data
-            elif isinstance(data, dict) and "@graph" in data: expanded = data["@graph"]
-            else: expanded = [data]
-            
-        expanded = cls.normalize_schema(expanded)
+    def frame_data(cls, data, frame, engine="pyld", observer=None):
+        """Expands, normalizes, and frames the input data.
+
+        engine selects the framing implementation (see FRAMING_ENGINES); an
+        observer receives the stage times and the number of framed entities.
+        """
+        if engine not in FRAMING_ENGINES:
+            raise ValueError(f"Unknown framing engine: {engine}")
+        with timed(observer, "load_json"):
+            data = cls.load_json(data)
+
+        entities = None
+        if engine == "native":
+            try:
+                with timed(observer, "frame"):
+                    framed = NativeFramer(frame, cls.custom_document_loader).frame(data)
+                entities = cls._framed_entities(framed)
+            except UnsupportedFeature:
+                # Outside the native subset; use pyld below
+                if observer is not None:
+                    observer.count("frame.native_fallbacks")
+
+        if entities is None:
+            entities = cls._frame_pyld(data, frame, observer)
+        if observer is not None:
+            observer.count("entities.framed", len(entities))
+        return entities
+
+    @classmethod
+    def _frame_pyld(cls, data, frame, observer=None):
+        # Imported on first use; the native framer handles most inputs without it
+        from pyld import jsonld
+
+        with timed(observer, "expand"):
+            try:
+                expanded = jsonld.expand(data, options={'documentLoader': cls.custom_document_loader})
+            except Exception as e:
+                # Offline mode asked to fail fast on a missing context
+                unavailable = _unavailable_context(e)
+                if unavailable is not None:
+                    raise unavailable from e
+                # Fallback for inaccessible contexts (copied, as it is normalized in place)
+                if isinstance(data, list): expanded = copy.deepcopy(data)
+                elif isinstance(data, dict) and "@graph" in data: expanded = copy.deepcopy(data["@graph"])
+                else: expanded = [copy.deepcopy(data)]
+
+        with timed(observer, "normalize_schema"):
+            expanded = cls.normalize_schema(expanded)
         
         # Flatten graph if necessary
         if isinstance(expanded, list) and len(expanded) == 1 and "@graph" in expanded[0]:
             expanded = expanded[0]["@graph"]
             
-        framed = jsonld.frame(expanded, frame)
+        with timed(observer, "frame"):
+            framed = jsonld.frame(
+                expanded, frame, options={'documentLoader': cls.custom_document_loader}
+            )
+        return cls._framed_entities(framed)
+
+    @staticmethod
+    def _framed_entities(framed):
         entities = framed.get('@graph', [framed])
         if not isinstance(entities, list): entities = [entities]
         return entities
@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+@contextmanager
+def locked_open(path, mode="a+b"):
+    """Opens a file, holding an exclusive lock on it until it is closed.
+
+    Without fcntl (Windows) the file is opened unlocked.
+    """
+    with open(path, mode) as f:
+        if fcntl is not None:
+            # Released when the file is closed
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield f
@@ -1,18 +1,161 @@
-import re
+import copy
+from . import geo
 from .cleaner import StringCleaner
+from .compiler import compile_field, compile_mapping, compile_path
+from .instrument import instrument_mapper
+
+_AFFILIATION_PATHS = [compile_path("affiliation"), compile_path("memberOf")]
+_CONTACT_PATHS = [compile_path("contactPoint"), compile_path("maintainer")]
+_DESCRIPTION_PATHS = [compile_path("description"), compile_path("comment")]
+_IDENTIFIER_PATHS = [compile_path("identifier")]
+# Author records kept in a converter's person cache (see _person_record)
+PERSON_CACHE_SIZE = 4096
+# The only fields of a person node an author record is built from
+_PERSON_FIELDS = (
+    "@id", "@type", "name", "givenName", "familyName", "contactPoint",
+    "affiliation", "memberOf",
+)
+
+
+def _structural_key(value):
+    """Hashable key equal for structurally equal JSON values.
+
+    Returns None if the value contains a bare reference ({"@id": ...} only),
+    as what such a reference resolves to depends on the mapper's entities.
+    """
+    t = type(value)
+    if t is str:
+        return value
+    if t is dict:
+        if len(value) == 1 and "@id" in value:
+            return None
+        items = tuple(value.items())
+        # Fast path for value objects such as {"@language": .., "@value": ..}
+        for _, v in items:
+            if type(v) is not str:
+                break
+        else:
+            return (dict, *items)
+        keys = []
+        for k, v in items:
+            v = _structural_key(v)
+            if v is None:
+                return None
+            keys.append((k, v))
+        return (dict, *keys)
+    if t is list:
+        items = []
+        for v in value:
+            v = _structural_key(v)
+            if v is None:
+                return None
+            items.append(v)
+        return (list, *items)
+    # Keeps 1, 1.0 and True apart
+    return (t, value)
 
 
 class MetadataMapper:
-    def __init__(self, mapping, all_entities=None):
+    def __init__(
+        self, mapping, all_entities=None, plan=None, observer=None, person_cache=None
+    ):
         self.mapping = mapping
+        # Compiled mapping; converters share one plan across all their mappers
+        self.plan = plan if plan is not None else compile_mapping(mapping)
+        # Author records by person structure; converters share one across datasets
+        self.person_cache = person_cache if person_cache is not None else {}
         self.cleaner = StringCleaner()
         self.all_entities = all_entities or []
+        if observer is not None:
+            instrument_mapper(self, observer)
+
+    @property
+    def all_entities(self):
+        return self._all_entities
+
+    @all_entities.setter
+    def all_entities(self, entities):
+        """Stores the entity list and rebuilds the @id and type indexes over it."""
+        self._all_entities = entities
+        self._node_index = self._build_node_index(entities)
+        # Per-node results of the ARC process graph (see _sample_crop)
+        self._crop_memo = {}
+        self._drone_memo = {}
+        self._type_index, self._additional_type_index = self._build_type_index(
+            entities
+        )
+
+    @staticmethod
+    def _as_str_list(value):
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, list):
+            return [v for v in value if isinstance(v, str)]
+        return []
+
+    @staticmethod
+    def _build_node_index(entities):
+        """Indexes every node carrying an @id, including nested framed nodes.
+
+        Top-level entities take precedence over nested embeddings, and bare
+        references (``{"@id": ...}`` only) are never indexed.
+        """
+        index = {}
+        for entity in entities:
+            if isinstance(entity, dict):
+                node_id = entity.get("@id")
+                if isinstance(node_id, str):
+                    index.setdefault(node_id, entity)
+
+        seen = set()
+        stack = list(entities)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+                node_id = node.get("@id")
+                if isinstance(node_id, str) and len(node) > 1:
+                    index.setdefault(node_id, node)
+                stack.extend(
+                    v for v in reversed(list(node.values()))
+                    if isinstance(v, (dict, list))
+                )
+        return index
+
+    @classmethod
+    def _build_type_index(cls, entities):
+        """Builds inverted indexes from @type and (@type, additionalType) to entities.
+
+        Entries keep their position in the entity list so that merged lookups
+        can be returned in document order.
+        """
+        type_index = {}
+        additional_type_index = {}
+        for pos, entity in enumerate(entities):
+            if not isinstance(entity, dict):
+                continue
+            types = dict.fromkeys(cls._as_str_list(entity.get("@type", [])))
+            if not types:
+                continue
+            add_types = dict.fromkeys(
+                cls._as_str_list(entity.get("additionalType", []))
+            )
+            for etype in types:
+                type_index.setdefault(etype, []).append(entity)
+                for atype in add_types:
+                    additional_type_index.setdefault((etype, atype), []).append(
+                        (pos, entity)
+                    )
+        return type_index, additional_type_index
 
-    def _get_nested(self, data, path):
-        """Helper to get value from nested dict using dot notation."""
-        if path == "@":
+    def _get_path(self, data, parts):
+        """Follows a compiled source path (see ``compile_path``) into nested data."""
+        if parts is None:
             return data
-        parts = path.split(".")
         for part in parts:
             if isinstance(data, dict):
                 data = data.get(part)
@@ -32,9 +175,9 @@ class MetadataMapper:
                 return None
         return data
 
-    def _resolve_source(self, entity, sources):
-        for source in sources:
-            val = self._get_nested(entity, source)
+    def _resolve_paths(self, entity, paths):
+        for parts in paths:
+            val = self._get_path(entity, parts)
             if val:
                 return val
         return None
@@ -45,33 +188,71 @@ class MetadataMapper:
             return ref
 
         ref_id = ref["@id"]
-        for entity in self.all_entities:
-            if entity.get("@id") == ref_id:
-                return entity
-        return ref
+        if not isinstance(ref_id, str):
+            return ref
+        return self._node_index.get(ref_id, ref)
 
     def _get_entities_by_type(self, etype, additional_types=None):
-        results = []
-        for e in self.all_entities:
-            types = e.get("@type", [])
-            if isinstance(types, str):
-                types = [types]
-            if etype in types:
-                if additional_types:
-                    add_types = e.get("additionalType", [])
-                    if isinstance(add_types, str):
-                        add_types = [add_types]
-                    if any(t in add_types for t in additional_types):
-                        results.append(e)
-                else:
-                    results.append(e)
-        return results
+        if not additional_types:
+            return list(self._type_index.get(etype, ()))
+
+        matches = {}
+        for atype in additional_types:
+            for pos, entity in self._additional_type_index.get((etype, atype), ()):
+                matches[pos] = entity
+        return [matches[pos] for pos in sorted(matches)]
 
     def _extract_person(self, person, seen):
         """Extracts an author object from a Person entity. Returns None if already seen."""
         if not isinstance(person, dict):
             return None
 
+        author_obj = self._person_record(person)
+        if author_obj is None:
+            return None
+        name = author_obj["authorName"]
+        if name in seen:
+            return None
+        seen.add(name)
+        # A copy, so records never share the cached object
+        return dict(author_obj)
+
+    def _person_record(self, person):
+        """Returns the author object of a Person entity, or None if it has no name.
+
+        The same people appear in many datasets of a flat Schema.org input, so
+        records are cached by the structure of the fields they are built from
+        and built once per unique person. Nodes with bare references in those
+        fields are built every time.
+        """
+        key = self._person_key(person)
+        if key is not None:
+            cache = self.person_cache
+            if key in cache:
+                return cache[key]
+        author_obj = self._build_person_record(person)
+        if key is not None:
+            if len(cache) >= PERSON_CACHE_SIZE:
+                # Evicts the oldest entry
+                del cache[next(iter(cache))]
+            cache[key] = author_obj
+        return author_obj
+
+    @staticmethod
+    def _person_key(person):
+        """Cache key of a person node for _person_record, or None if it has none."""
+        key = []
+        for field in _PERSON_FIELDS:
+            value = person.get(field)
+            # Most fields are strings or absent, which are their own keys
+            if value is not None and type(value) is not str:
+                value = _structural_key(value)
+                if value is None:
+                    return None
+            key.append(value)
+        return tuple(key)
+
+    def _build_person_record(self, person):
         # Try to get the name: prefer explicit 'name', then givenName+familyName, then contactPoint
         name = None
         if person.get("name"):
@@ -85,13 +266,12 @@ class MetadataMapper:
             cp = person["contactPoint"]
             name = self._get_literal(cp.get("name"))
 
-        if not name or name in seen:
+        if not name:
             return None
-        seen.add(name)
 
         author_obj = {"authorName": name}
 
-        affiliation = self._resolve_source(person, ["affiliation", "memberOf"])
+        affiliation = self._resolve_paths(person, _AFFILIATION_PATHS)
         if affiliation:
             author_obj["authorAffiliation"] = (
                 self._get_literal(affiliation) or "Unknown"
@@ -183,58 +363,79 @@ class MetadataMapper:
 
         return authors
 
+    @staticmethod
+    def _as_list(value):
+        return value if isinstance(value, list) else [value]
+
+    def _lab_process(self, proc_ref):
+        """Resolves a reference to a LabProcess node, or returns None."""
+        proc = self._resolve_ref(proc_ref)
+        if isinstance(proc, dict) and "LabProcess" in str(proc.get("@type", "")):
+            return proc
+        return None
+
+    def _sample_crop(self, sample_ref):
+        """Returns the crop info of a Sample (None if it has none), memoized per node.
+
+        Samples are shared by the processes of every Study and Assay that use
+        them, so each one is read once per load.
+        """
+        sample = self._resolve_ref(sample_ref)
+        if not isinstance(sample, dict):
+            return None
+        key = id(sample)
+        if key in self._crop_memo:
+            return self._crop_memo[key]
+
+        crop_info = {}
+        if "Sample" in str(sample.get("@type", "")):
+            for prop in self._as_list(sample.get("additionalProperty", [])):
+                prop = self._resolve_ref(prop)
+                if isinstance(prop, dict):
+                    name = prop.get("name")
+                    if name == "Organism":
+                        crop_info["_crop_species"] = str(prop.get("value", ""))
+                        crop_info["_crop_species_uri"] = str(prop.get("valueRef", ""))
+                    elif name == "Infection Taxon":
+                        crop_info["_crop_pest_name"] = str(prop.get("value", ""))
+                        crop_info["_crop_pest_uri"] = str(prop.get("valueRef", ""))
+        self._crop_memo[key] = crop_info or None
+        return self._crop_memo[key]
+
+    def _process_drone(self, proc):
+        """Returns (manufacturer, model) from a LabProcess's parameterValues, memoized."""
+        key = id(proc)
+        drone = self._drone_memo.get(key)
+        if drone is None:
+            manufacturer = ""
+            model = ""
+            for param_ref in self._as_list(proc.get("parameterValue", [])):
+                param = self._resolve_ref(param_ref)
+                if isinstance(param, dict):
+                    if param.get("name") == "Drone Manufacturer":
+                        manufacturer = self._get_literal(param.get("value"))
+                    elif param.get("name") == "Drone Model":
+                        model = self._get_literal(param.get("value"))
+            drone = self._drone_memo[key] = (manufacturer, model)
+        return drone
+
     def _extract_crops(self):
         crops = []
         seen = set()
         studies = self._get_entities_by_type("Dataset", ["Study"])
 
         for study in studies:
-            about = study.get("about", [])
-            if not isinstance(about, list):
-                about = [about]
-            for proc_ref in about:
-                proc = self._resolve_ref(proc_ref)
-                if isinstance(proc, dict) and "LabProcess" in str(
-                    proc.get("@type", "")
-                ):
-                    objects = proc.get("object", [])
-                    if not isinstance(objects, list):
-                        objects = [objects]
-                    for obj_ref in objects:
-                        sample = self._resolve_ref(obj_ref)
-                        if isinstance(sample, dict) and "Sample" in str(
-                            sample.get("@type", "")
-                        ):
-                            props = sample.get("additionalProperty", [])
-                            if not isinstance(props, list):
-                                props = [props]
-
-                            crop_info = {}
-                            for prop in props:
-                                prop = self._resolve_ref(prop)
-                                if isinstance(prop, dict):
-                                    name = prop.get("name")
-                                    if name == "Organism":
-                                        crop_info["_crop_species"] = str(
-                                            prop.get("value", "")
-                                        )
-                                        crop_info["_crop_species_uri"] = str(
-                                            prop.get("valueRef", "")
-                                        )
-                                    elif name == "Infection Taxon":
-                                        crop_info["_crop_pest_name"] = str(
-                                            prop.get("value", "")
-                                        )
-                                        crop_info["_crop_pest_uri"] = str(
-                                            prop.get("valueRef", "")
-                                        )
-
-                            if crop_info:
-                                # Create a unique key for deduplication
-                                key = f"{crop_info.get('_crop_species')}|{crop_info.get('_crop_pest_name')}"
-                                if key not in seen:
-                                    seen.add(key)
-                                    crops.append(crop_info)
+            for proc_ref in self._as_list(study.get("about", [])):
+                proc = self._lab_process(proc_ref)
+                if proc is None:
+                    continue
+                for obj_ref in self._as_list(proc.get("object", [])):
+                    crop_info = self._sample_crop(obj_ref)
+                    if crop_info:
+                        key = (crop_info.get("_crop_species"), crop_info.get("_crop_pest_name"))
+                        if key not in seen:
+                            seen.add(key)
+                            crops.append(dict(crop_info))
         return crops
 
     def _extract_sensors(self):
@@ -243,51 +444,27 @@ class MetadataMapper:
         assays = self._get_entities_by_type("Dataset", ["Assay"])
 
         for assay in assays:
-            about = assay.get("about", [])
-            if not isinstance(about, list):
-                about = [about]
-
             measurement_method = self._get_literal(assay.get("measurementMethod"))
             measurement_technique = self._get_literal(assay.get("measurementTechnique"))
 
-            for proc_ref in about:
-                proc = self._resolve_ref(proc_ref)
-                if isinstance(proc, dict) and "LabProcess" in str(
-                    proc.get("@type", "")
-                ):
-                    # Collect metadata from parameterValue of the LabProcess
-                    params = proc.get("parameterValue", [])
-                    if not isinstance(params, list):
-                        params = [params]
-
-                    manufacturer = ""
-                    model = ""
-                    for param_ref in params:
-                        param = self._resolve_ref(param_ref)
-                        if isinstance(param, dict):
-                            if param.get("name") == "Drone Manufacturer":
-                                manufacturer = self._get_literal(param.get("value"))
-                            elif param.get("name") == "Drone Model":
-                                model = self._get_literal(param.get("value"))
-
-                    # Requirements: Create a sensor object for EACH object in proc
-                    objects = proc.get("object", [])
-                    if not isinstance(objects, list):
-                        objects = [objects]
-                    for obj in objects:
-                        sensor_obj = {
-                            "_sensor_type": measurement_method,
-                            "sensorIsHostedBy": {
-                                "_platform_type": measurement_technique,
-                                "_manufacturer": manufacturer,
-                                "_model": model,
-                            },
-                        }
-                        # Deduplicate by all fields
-                        key = f"{measurement_method}|{measurement_technique}|{manufacturer}|{model}"
-                        if key not in seen:
-                            seen.add(key)
-                            sensors.append(sensor_obj)
+            for proc_ref in self._as_list(assay.get("about", [])):
+                proc = self._lab_process(proc_ref)
+                # Requirements: a sensor object for each object of the process,
+                # which after deduplication means one per process with objects
+                if proc is None or not self._as_list(proc.get("object", [])):
+                    continue
+                manufacturer, model = self._process_drone(proc)
+                key = (measurement_method, measurement_technique, manufacturer, model)
+                if key not in seen:
+                    seen.add(key)
+                    sensors.append({
+                        "_sensor_type": measurement_method,
+                        "sensorIsHostedBy": {
+                            "_platform_type": measurement_technique,
+                            "_manufacturer": manufacturer,
+                            "_model": model,
+                        },
+                    })
         return sensors
 
     def _get_literal(self, v):
@@ -328,31 +505,37 @@ class MetadataMapper:
             return self.cleaner.clean(v)
         return str(v)
 
+    def _literal_field(self, name, val, wrap):
+        lit = str(self._get_literal(val))
+        if wrap:
+            return {name: {"value": lit, "aiGenerated": False}}
+        return {name: lit}
+
+    def _subfield_value(self, item, sub):
+        # Placeholders come from special extractions (crop/sensor/geo)
+        if sub.placeholder:
+            return item.get(sub.placeholder)
+        return self._resolve_paths(item, sub.paths)
+
     def format_field(self, name, val, cfg):
-        ftype = cfg.get("type", "string")
+        """Formats a value for a raw field configuration (compiled on the fly)."""
+        return self._format(compile_field(name, cfg), val)
 
-        # Specialized logic for Geo Bounding Boxes
-        geo_fields = [
-            "westLongitude",
-            "eastLongitude",
-            "northLatitude",
-            "southLatitude",
-        ]
-        if name in geo_fields or any(
-            k in str(cfg.get("mapping", {})) for k in ["_geo_"]
-        ):
-            lit_val = self._get_literal(val)
-            if isinstance(lit_val, (str, bytes)):
-                geo_vals = self._parse_geo_box(str(lit_val))
-                if geo_vals:
-                    # If we are inside a complex_list mapping, return the dict
-                    return geo_vals
+    def _format(self, field, val):
+        """Formats a value according to a compiled FieldPlan."""
+        name = field.name
 
+        # Specialized logic for Geo Bounding Boxes
+        if field.geo:
+            # Spatial values without coordinates leave the field out
+            bounds = self._geo_bounds(val)
+            for side in field.geo_wrap.intersection(bounds):
+                bounds[side] = {"value": str(bounds[side]), "aiGenerated": False}
+            return bounds
+
+        ftype = field.type
         if ftype == "string":
-            lit = str(self._get_literal(val))
-            if cfg.get("wrap"):
-                return {name: {"value": lit, "aiGenerated": False}}
-            return {name: lit}
+            return self._literal_field(name, val, field.wrap)
 
         if ftype == "string_array":
             if isinstance(val, str):
@@ -364,293 +547,207 @@ class MetadataMapper:
             return {name: vals}
 
         if ftype == "complex_list":
-            items = []
-            if not isinstance(val, list):
-                val = [val]
-            for item in val:
-                sub_fields = {}
-                # If no mapping, and item is a dict, just use it (pass-through for defaults)
-                if not cfg.get("mapping"):
-                    if isinstance(item, dict):
-                        items.append(item)
-                    continue
-
-                # Special cases for geo/crop/sensor where we use placeholders
+            return {name: self._format_complex_list(field, val)}
+
+        # complex
+        if not field.has_mapping:
+            # Pass-through for defaults
+            if isinstance(val, dict):
+                return {name: val}
+            return {name: {}}
+
+        # Nested object (like sensorIsHostedBy)
+        obj = {}
+        for sub in field.subfields:
+            if sub.simple:
+                continue
+            sub_val = self._subfield_value(val, sub)
+            if sub_val:
+                obj.update(self._literal_field(sub.name, sub_val, sub.wrap))
+        return {name: obj}
+
+    def _format_complex_list(self, field, val):
+        items = []
+        if not isinstance(val, list):
+            val = [val]
+        for item in val:
+            # If no mapping, and item is a dict, just use it (pass-through for defaults)
+            if not field.has_mapping:
                 if isinstance(item, dict):
-                    # Check for geo box mapping
-                    if "_geo_west" in str(cfg.get("mapping", {})):
-                        geo = self._parse_geo_box(self._get_literal(item))
-                        if geo:
-                            for k, v in geo.items():
-                                sub_cfg = cfg["mapping"].get(k, {})
-                                if sub_cfg.get("wrap"):
-                                    sub_fields[k] = {
-                                        "value": str(v),
-                                        "aiGenerated": False,
-                                    }
-                                else:
-                                    sub_fields[k] = str(v)
-                    else:
-                        for sub_name, sub_cfg in cfg.get("mapping", {}).items():
-                            if isinstance(sub_cfg, dict) and sub_cfg.get("type") == "complex" and "mapping" in sub_cfg:
-                                # Nested complex object (e.g. sensorIsHostedBy) — build from its own mapping
-                                nested_item = item.get(sub_name, {})
-                                if isinstance(nested_item, dict):
-                                    nested_obj = {}
-                                    for n_name, n_cfg in sub_cfg["mapping"].items():
-                                        if isinstance(n_cfg, dict):
-                                            n_sources = n_cfg.get("source", [])
-                                            if n_sources and n_sources[0].startswith("_"):
-                                                n_val = nested_item.get(n_sources[0])
-                                            else:
-                                                n_val = self._resolve_source(nested_item, n_sources)
-                                            if n_val:
-                                                lit = str(self._get_literal(n_val))
-                                                if n_cfg.get("wrap"):
-                                                    nested_obj[n_name] = {"value": lit, "aiGenerated": False}
-                                                else:
-                                                    nested_obj[n_name] = lit
-                                    if nested_obj:
-                                        sub_fields[sub_name] = nested_obj
-                            elif isinstance(sub_cfg, dict):
-                                sub_sources = sub_cfg.get("source", [])
-                                # Handle placeholders from special extractions
-                                if sub_sources and sub_sources[0].startswith("_"):
-                                    sub_val = item.get(sub_sources[0])
-                                else:
-                                    sub_val = self._resolve_source(item, sub_sources)
-
-                                if sub_val:
-                                    lit = str(self._get_literal(sub_val))
-                                    if sub_cfg.get("wrap"):
-                                        sub_fields[sub_name] = {
-                                            "value": lit,
-                                            "aiGenerated": False,
-                                        }
-                                    else:
-                                        sub_fields[sub_name] = lit
-                            elif isinstance(sub_cfg, list):
-                                # Simple mapping
-                                sub_val = self._resolve_source(item, sub_cfg)
-                                if sub_val:
-                                    sub_fields[sub_name] = str(
-                                        self._get_literal(sub_val)
+                    items.append(item)
+                continue
+
+            sub_fields = {}
+            if isinstance(item, dict):
+                for sub in field.subfields:
+                    if sub.nested is not None:
+                        # Nested complex object (e.g. sensorIsHostedBy)
+                        nested_item = item.get(sub.name, {})
+                        if isinstance(nested_item, dict):
+                            nested_obj = {}
+                            for n_sub in sub.nested:
+                                n_val = self._subfield_value(nested_item, n_sub)
+                                if n_val:
+                                    nested_obj.update(
+                                        self._literal_field(
+                                            n_sub.name, n_val, n_sub.wrap
+                                        )
                                     )
-                else:
-                    # Item is a literal (e.g. from dsDescription or keyword)
-                    for sub_name, sub_cfg in cfg.get("mapping", {}).items():
-                        sub_sources = (
-                            sub_cfg
-                            if isinstance(sub_cfg, list)
-                            else sub_cfg.get("source", [])
-                        )
-                        if "@" in sub_sources:
-                            sub_fields[sub_name] = str(self._get_literal(item))
-
-                if sub_fields:
-                    items.append(sub_fields)
-            return {name: items}
-
-        if ftype == "complex":
-            # If no mapping, and item is a dict, just use it (pass-through for defaults)
-            if not cfg.get("mapping"):
-                if isinstance(val, dict):
-                    return {name: val}
-                return {name: {}}
-
-            # Nested object (like sensorIsHostedBy)
-            obj = {}
-            for sub_name, sub_cfg in cfg.get("mapping", {}).items():
-                if isinstance(sub_cfg, dict):
-                    sub_sources = sub_cfg.get("source", [])
-                    sub_val = self._resolve_source(val, sub_sources)
-                    if sub_sources and sub_sources[0].startswith("_"):
-                        sub_val = val.get(sub_sources[0])
-
-                    if sub_val:
-                        lit = str(self._get_literal(sub_val))
-                        if sub_cfg.get("wrap"):
-                            obj[sub_name] = {"value": lit, "aiGenerated": False}
-                        else:
-                            obj[sub_name] = lit
-            return {name: obj}
-
-        return {name: str(self._get_literal(val))}
-
-    def _parse_geo_box(self, box_str):
-        """Parses a Schema.org box string into a dict using regex."""
-        try:
-            nums = [float(n) for n in re.findall(r"[-+]?\d*\.?\d+", box_str)]
-            if len(nums) >= 4:
-                lats = [nums[0], nums[2]]
-                lons = [nums[1], nums[3]]
-                return {
-                    "westLongitude": min(lons),
-                    "eastLongitude": max(lons),
-                    "northLatitude": max(lats),
-                    "southLatitude": min(lats),
+                            if nested_obj:
+                                sub_fields[sub.name] = nested_obj
+                    else:
+                        sub_val = self._subfield_value(item, sub)
+                        if sub_val:
+                            sub_fields.update(
+                                self._literal_field(sub.name, sub_val, sub.wrap)
+                            )
+            else:
+                # Item is a literal (e.g. from dsDescription or keyword)
+                for sub_name in field.literal_targets:
+                    sub_fields[sub_name] = str(self._get_literal(item))
+
+            if sub_fields:
+                items.append(sub_fields)
+        return items
+
+    def _geo_bounds(self, val):
+        """Returns the bounding box of a spatial value (see geo.shape_bounds)."""
+        return geo.shape_bounds(val, self._resolve_ref)
+
+    def _map_author(self, entity, field, block_data):
+        val = self._extract_authors()
+        if not val:
+            val = [
+                {
+                    "authorName": "Unknown",
+                    "authorAffiliation": "Unknown",
+                    "authorIdentifier": "Unknown",
+                    "authorIdentifierScheme": "Other",
                 }
-        except Exception:
-            pass
-        return {}
+            ]
+        block_data["author"] = val
+        return True
+
+    def _map_alternative_title(self, entity, field, block_data):
+        titles = []
+        for ds in self._get_entities_by_type("Dataset", ["Study", "Assay"]):
+            name = self._get_literal(ds.get("name"))
+            if name:
+                titles.append(name)
+        if titles:
+            block_data["alternativeTitle"] = titles
+        return True
+
+    def _map_dataset_contact(self, entity, field, block_data):
+        # Try to extract contact from entity
+        contacts = self._resolve_paths(entity, _CONTACT_PATHS)
+        if not contacts:
+            # Default internal FAIRagro contact if nothing found
+            val = field.default
+        else:
+            if not isinstance(contacts, list):
+                contacts = [contacts]
+            val = []
+            for c_raw in contacts:
+                c = self._resolve_ref(c_raw)
+                c_name = self._get_literal(c.get("name") or c.get("givenName"))
+                c_email = self._get_literal(c.get("email"))
+                if c_email:
+                    val.append(
+                        {
+                            "datasetContactName": c_name or "Unknown",
+                            "datasetContactEmail": c_email,
+                        }
+                    )
+            if not val:
+                val = field.default
+
+        if val:
+            block_data["datasetContact"] = val
+        return True
+
+    def _map_ds_description(self, entity, field, block_data):
+        # Try top-level description first; the regular field path handles it
+        if self._resolve_paths(entity, _DESCRIPTION_PATHS):
+            return False
+
+        # Fall back to aggregating descriptions from Study/Assay parts
+        seen_descs = set()
+        desc_items = []
+        for ds in self._get_entities_by_type("Dataset", ["Study", "Assay"]):
+            d = self._get_literal(ds.get("description") or ds.get("comment"))
+            if d and d not in seen_descs:
+                seen_descs.add(d)
+                desc_items.append({"dsDescriptionValue": d})
+        if desc_items:
+            block_data["dsDescription"] = desc_items
+        return True
+
+    def _map_other_id(self, entity, field, block_data):
+        identifiers = self._resolve_paths(entity, _IDENTIFIER_PATHS)
+        if identifiers:
+            if not isinstance(identifiers, list):
+                identifiers = [identifiers]
+            other_ids = []
+            for ident in identifiers:
+                ident_str = str(self._get_literal(ident))
+                if not ident_str or ident_str in ("None", ""):
+                    continue
+                agency = "DOI" if "doi.org" in ident_str else "Other"
+                other_ids.append({"otherIdValue": ident_str, "otherIdAgency": agency})
+            if other_ids:
+                block_data["otherId"] = other_ids
+        return True
+
+    _FIELD_HANDLERS = {
+        "author": _map_author,
+        "alternativeTitle": _map_alternative_title,
+        "datasetContact": _map_dataset_contact,
+        "dsDescription": _map_ds_description,
+        "otherId": _map_other_id,
+    }
+
+    _BLOCK_EXTRACTORS = {
+        "crop": _extract_crops,
+        "sensor": _extract_sensors,
+    }
 
     def map_entity(self, entity):
         """Maps an entity to FAIRagro Core spec blocks."""
         result = {}
-        for block_name, block_cfg in self.mapping.get("blocks", {}).items():
+        for block in self.plan.blocks:
             block_data = {}
 
-            # Special Block Handling
-            if block_name == "crop":
-                crops = self._extract_crops()
-                if crops:
-                    formatted = self.format_field(
-                        "crop", crops, block_cfg["fields"][0]["crop"]
-                    )
-                    block_data.update(formatted)
-            elif block_name == "sensor":
-                sensors = self._extract_sensors()
-                if sensors:
-                    formatted = self.format_field(
-                        "sensor", sensors, block_cfg["fields"][0]["sensor"]
-                    )
-                    block_data.update(formatted)
+            if block.extractor:
+                # Special Block Handling (crop / sensor)
+                values = self._BLOCK_EXTRACTORS[block.extractor](self)
+                if values:
+                    block_data.update(self._format(block.fields[0], values))
             else:
-                for field_cfg in block_cfg.get("fields", []):
-                    field_name = list(field_cfg.keys())[0]
-                    cfg = field_cfg[field_name]
-                    val = None
-
+                for field in block.fields:
                     # Special Field Handling
-                    if block_name == "citation":
-                        if field_name == "author":
-                            val = self._extract_authors()
-                            if not val:
-                                val = [
-                                    {
-                                        "authorName": "Unknown",
-                                        "authorAffiliation": "Unknown",
-                                        "authorIdentifier": "Unknown",
-                                        "authorIdentifierScheme": "Other",
-                                    }
-                                ]
-                            block_data["author"] = val
-                            continue
-                        elif field_name == "alternativeTitle":
-                            titles = []
-                            datasets = self._get_entities_by_type(
-                                "Dataset", ["Study", "Assay"]
-                            )
-                            for ds in datasets:
-                                name = self._get_literal(ds.get("name"))
-                                if name:
-                                    titles.append(name)
-                            if titles:
-                                block_data["alternativeTitle"] = titles
-                            continue
-                        elif field_name == "datasetContact":
-                            # Try to extract contact from entity
-                            contacts = self._resolve_source(
-                                entity, ["contactPoint", "maintainer"]
-                            )
-                            if not contacts:
-                                # Default internal FAIRagro contact if nothing found
-                                val = cfg.get("default")
-                            else:
-                                if not isinstance(contacts, list):
-                                    contacts = [contacts]
-                                val = []
-                                for c_raw in contacts:
-                                    c = self._resolve_ref(c_raw)
-                                    c_name = self._get_literal(
-                                        c.get("name") or c.get("givenName")
-                                    )
-                                    c_email = self._get_literal(c.get("email"))
-                                    if c_email:
-                                        val.append(
-                                            {
-                                                "datasetContactName": c_name
-                                                or "Unknown",
-                                                "datasetContactEmail": c_email,
-                                            }
-                                        )
-                                if not val:
-                                    val = cfg.get("default")
-
-                            if val:
-                                block_data["datasetContact"] = val
-                            continue
-                        elif field_name == "dsDescription":
-                            # Try top-level description first
-                            desc = self._resolve_source(
-                                entity, ["description", "comment"]
-                            )
-                            if not desc:
-                                # Fall back to aggregating descriptions from Study/Assay parts
-                                seen_descs = set()
-                                desc_items = []
-                                for ds in self._get_entities_by_type(
-                                    "Dataset", ["Study", "Assay"]
-                                ):
-                                    d = self._get_literal(
-                                        ds.get("description") or ds.get("comment")
-                                    )
-                                    if d and d not in seen_descs:
-                                        seen_descs.add(d)
-                                        desc_items.append({"dsDescriptionValue": d})
-                                if desc_items:
-                                    block_data["dsDescription"] = desc_items
-                                continue
-                            # Otherwise let the normal format_field path handle it
-                        elif field_name == "otherId":
-                            identifiers = self._resolve_source(entity, ["identifier"])
-                            if identifiers:
-                                if not isinstance(identifiers, list):
-                                    identifiers = [identifiers]
-                                other_ids = []
-                                for ident in identifiers:
-                                    ident_str = str(self._get_literal(ident))
-                                    if not ident_str or ident_str in ("None", ""):
-                                        continue
-                                    agency = (
-                                        "DOI" if "doi.org" in ident_str else "Other"
-                                    )
-                                    other_ids.append(
-                                        {
-                                            "otherIdValue": ident_str,
-                                            "otherIdAgency": agency,
-                                        }
-                                    )
-                                if other_ids:
-                                    block_data["otherId"] = other_ids
-                            continue
+                    if field.handler and self._FIELD_HANDLERS[field.handler](
+                        self, entity, field, block_data
+                    ):
+                        continue
 
-                    if "source" in cfg:
-                        val = self._resolve_source(entity, cfg["source"])
+                    val = None
+                    if field.paths is not None:
+                        val = self._resolve_paths(entity, field.paths)
 
-                    if (val is None or val == "" or val == []) and "default" in cfg:
-                        val = cfg["default"]
+                    if (val is None or val == "" or val == []) and field.has_default:
+                        val = field.default
 
                     if val is not None:
-                        formatted = self.format_field(field_name, val, cfg)
-                        block_data.update(formatted)
+                        block_data.update(self._format(field, val))
 
             # Ensure mandatory fields are present in the block
-            mandatory_fallbacks = {
-                "citation": {
-                    "dsDescription": [
-                        {"dsDescriptionValue": "No description available"}
-                    ],
-                    "otherId": [{"otherIdValue": "Unknown", "otherIdAgency": "Other"}],
-                }
-            }
-            if block_name in mandatory_fallbacks:
-                for field, fallback_val in mandatory_fallbacks[block_name].items():
-                    if field not in block_data:
-                        block_data[field] = fallback_val
+            for name, fallback_val in block.fallbacks.items():
+                if name not in block_data:
+                    block_data[name] = copy.deepcopy(fallback_val)
 
             if block_data:
-                result[block_name] = block_data
+                result[block.name] = block_data
 
         # Add identifier if present
         identifier = self._get_literal(entity.get("identifier")) or self._get_literal(
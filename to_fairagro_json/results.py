@@ -0,0 +1,44 @@
+import json
+from . import jsonio
+from .diskcache import DEFAULT_MAX_BYTES, DiskCache, content_hash
+
+# Bump when a code change alters the records produced for unchanged configs
+RESULT_FORMAT_VERSION = "1"
+
+
+def canonical_json(data):
+    """Serializes data with sorted keys and no whitespace, for hashing."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class ResultCache:
+    """On-disk cache of the mapped records of individual datasets.
+
+    Entries live in a size-bounded DiskCache, keyed by the hash of the
+    canonical dataset combined with ``config_hash`` (the frame, mapping and
+    framing engine of the converter). Changing any of them changes every key,
+    so stale results are never read and simply age out under eviction.
+    """
+
+    def __init__(self, cache_dir, config_hash, max_bytes=DEFAULT_MAX_BYTES):
+        self.blobs = DiskCache(cache_dir, max_bytes=max_bytes)
+        self.config_hash = config_hash
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, dataset):
+        return content_hash(
+            f"{RESULT_FORMAT_VERSION}:{self.config_hash}:{canonical_json(dataset)}"
+        )
+
+    def get(self, key):
+        """Returns the cached records for a key, or None."""
+        data = self.blobs.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return jsonio.loads(data)
+
+    def put(self, key, records):
+        self.blobs.put(key, jsonio.dumps(records))
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from . import jsonio
+from .cli import add_context_options, apply_context_options
+from .converter import _get_converter, _init_worker
+from .loader import DocumentLoader
+from .sniff import AUTO_PROFILE, PROFILES, SNIFF_BYTES, sniff_profile
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8471
+# Request bodies above this size are rejected with 413
+MAX_BODY_BYTES = 64 * 1024 * 1024
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Content Too Large", 500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Answered with the given status and a {"error": message} body."""
+
+    def __init__(self, status, message):
+        # Both in args, so the error survives the trip back from a worker process
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def _convert_document(task):
+    """Converts one request body with the worker's warm converter.
+
+    Returns the records serialized to compact bytes, which are cheaper to
+    send back from a worker process than the records themselves.
+    """
+    converter_args, body = task
+    try:
+        data = jsonio.loads(body)
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON: {e}")
+    args, options = converter_args
+    converter = _get_converter(*args, **options)
+    converter.load(data)
+    records = converter.convert()
+    if records is None:
+        return None
+    if isinstance(records, dict):
+        return jsonio.dumps(records)
+    return [jsonio.dumps(record) for record in records]
+
+
+def mapping_targets():
+    """Returns the names of the mapping targets under config/."""
+    config_dir = Path(__file__).parent.parent / "config"
+    return tuple(sorted(path.parent.name for path in config_dir.glob("*/mapping.yaml")))
+
+
+def _ready():
+    """No-op task that makes the pool start (and initialize) a worker."""
+    return os.getpid()
+
+
+class ConversionServer:
+    """HTTP service converting POSTed documents with preloaded converters.
+
+    ``POST /convert[?type=<profile>][&target=..][&format=json|ndjson]`` takes
+    one input document (as main.py would read from a file) and answers with
+    its records: compact JSON shaped as convert() returns it, or one record
+    per line. ``GET /health`` reports the loaded profiles. Connections are
+    kept alive between requests. Without a type (or with type=auto) the
+    profile is sniffed from the first bytes of the body. target must be one
+    of the mapping targets found under config/ when the server is created.
+
+    Conversions run on a pool of ``workers`` processes (default: all cores),
+    each holding one converter per profile and target for its whole life, so
+    a request pays neither imports nor frame and mapping parsing. workers=0
+    converts in a single thread of the server process instead. At most one
+    conversion per worker is in flight; further requests wait for a free
+    worker.
+    """
+
+    def __init__(self, workers=None, framer=None, target="fairagro"):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.framer = framer
+        self.targets = mapping_targets()
+        if target not in self.targets:
+            raise ValueError(f"Unknown target {target!r}: use one of {', '.join(self.targets)}")
+        self.target = target
+        self._executor = None
+        self._slots = None
+        self._server = None
+
+    async def _start_pool(self):
+        profiles = [
+            ((profile, target, self.framer), {})
+            for profile in PROFILES for target in self.targets
+        ]
+        if self.workers == 0:
+            # One thread: converters hold the entities of their last document
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            for args, options in profiles:
+                _get_converter(*args, **options)
+        else:
+            # Forked workers would inherit the sockets of open connections and
+            # keep them from closing; forkserver children start clean
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+                initargs=(DocumentLoader.context_config, profiles),
+            )
+            # Start every worker now, so no request waits for converter setup
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(self._executor, _ready) for _ in range(self.workers)
+            ))
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        """Starts listening on host:port, or on a Unix socket if unix_path is set."""
+        await self._start_pool()
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle, unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        server = await self.start(host, port, unix_path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    await self._dispatch(method, target, body, writer)
+                except HttpError as e:
+                    await self._send_error(writer, e.status, e.message)
+                except Exception as e:
+                    await self._send_error(writer, 500, f"{type(e).__name__}: {e}")
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            # The request could not be read, so the connection is not reusable
+            await self._send_error(writer, e.status, e.message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """Returns (method, target, headers, body), or None at end of stream."""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise HttpError(411, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    async def _dispatch(self, method, target, body, writer):
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HttpError(405, "Use GET")
+            health = {
+                "status": "ok", "profiles": list(PROFILES), "targets": list(self.targets),
+                "workers": self.workers,
+            }
+            await self._send(writer, 200, "json", [jsonio.dumps(health)])
+            return
+        if url.path != "/convert":
+            raise HttpError(404, f"Unknown path: {url.path}")
+        if method != "POST":
+            raise HttpError(405, "Use POST")
+
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        profile = query.get("type", AUTO_PROFILE)
+        if profile not in PROFILES and profile != AUTO_PROFILE:
+            raise HttpError(
+                400, f"type must be one of {', '.join([*PROFILES, AUTO_PROFILE])}"
+            )
+        target_name = query.get("target", self.target)
+        if target_name not in self.targets:
+            raise HttpError(400, f"target must be one of {', '.join(self.targets)}")
+        output_format = query.get("format", "json")
+        if output_format not in CONTENT_TYPES:
+            raise HttpError(400, f"format must be one of {', '.join(CONTENT_TYPES)}")
+        if not body:
+            raise HttpError(400, "Empty request body")
+        if profile == AUTO_PROFILE:
+            profile = sniff_profile(body[:SNIFF_BYTES])
+            if profile is None:
+                raise HttpError(400, "Cannot detect the input type: not a JSON object or array")
+
+        converter_args = ((profile, target_name, self.framer), {})
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            records = await loop.run_in_executor(
+                self._executor, _convert_document, (converter_args, body)
+            )
+        await self._send(writer, 200, output_format, self._chunks(records, output_format))
+
+    @staticmethod
+    def _chunks(records, output_format):
+        """Yields the response body of the records, one record at a time."""
+        if records is None:
+            if output_format == "json":
+                yield b"null"
+            return
+        if not isinstance(records, list):
+            yield records + b"\n" if output_format == "ndjson" else records
+            return
+        if output_format == "ndjson":
+            for record in records:
+                yield record + b"\n"
+            return
+        for i, record in enumerate(records):
+            yield (b"[" if i == 0 else b",") + record
+        yield b"]"
+
+    @staticmethod
+    async def _send(writer, status, output_format, chunks):
+        """Writes a chunked response, flushing after each chunk."""
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {CONTENT_TYPES[output_format]}\r\n"
+            "Transfer-Encoding: chunked\r\n\r\n".encode("latin-1")
+        )
+        for chunk in chunks:
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_error(self, writer, status, message):
+        await self._send(writer, status, "json", [jsonio.dumps({"error": message})])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve conversions over HTTP with preloaded converters"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Conversion processes (defaults to all cores; 0 = in the server process)",
+    )
+    parser.add_argument(
+        "--framer",
+        choices=["native", "pyld"],
+        help="JSON-LD framing engine (defaults to the profile's engine)",
+    )
+    add_context_options(parser)
+    args = parser.parse_args()
+    apply_context_options(args)
+    server = ConversionServer(workers=args.workers, framer=args.framer)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving conversions on {where}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
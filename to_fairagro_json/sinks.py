@@ -0,0 +1,144 @@
+import os
+import tempfile
+from pathlib import Path
+from . import jsonio
+
+
+class Sink:
+    """Writes output records to a file as they are produced.
+
+    Records are written to path as they arrive, so readers can consume a
+    conversion while it runs; abort() stops without finishing the file (a
+    JSON array is left unterminated). With atomic=True they go to a
+    temporary file next to path instead, which replaces path when the sink
+    is closed and is deleted by abort(), so path only ever holds a complete
+    output. The file is created on the first record, so a conversion without
+    records leaves no output behind. Records are serialized straight to
+    UTF-8 bytes (see jsonio). Use as a context manager or call close().
+    """
+
+    def __init__(self, path, compact=False, atomic=False):
+        self.path = Path(path)
+        self.compact = compact
+        self.atomic = atomic
+        self.count = 0
+        self._file = None
+        self._tmp = None
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.atomic:
+                fd, self._tmp = tempfile.mkstemp(
+                    dir=self.path.parent, prefix=f".tmp-{self.path.name}-"
+                )
+                # mkstemp creates the file private; give it the mode open() would
+                os.chmod(fd, 0o666 & ~_umask())
+                self._file = os.fdopen(fd, "wb")
+            else:
+                self._file = open(self.path, "wb")
+        return self._file
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        """Finishes the output (and moves it into place if atomic)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp is not None:
+            os.replace(self._tmp, self.path)
+            self._tmp = None
+
+    def abort(self):
+        """Stops writing without finishing the output (discarded if atomic)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp is not None:
+            Path(self._tmp).unlink(missing_ok=True)
+            self._tmp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class JsonSink(Sink):
+    """Pretty-printed JSON (indent=2), the converter's default output.
+
+    A single record is written as an object, several as an array. The first
+    record is held back until the second one arrives; after that every record
+    is appended as soon as it is written. With compact=True the same layout is
+    written without whitespace, using the fast JSON backend if installed.
+    """
+
+    def __init__(self, path, compact=False, atomic=False):
+        super().__init__(path, compact, atomic)
+        self._first = None
+
+    def write(self, record):
+        self.count += 1
+        if self.count == 1:
+            self._first = record
+            return
+        f = self._open()
+        if self.count == 2:
+            f.write(b"[" if self.compact else b"[\n")
+            f.write(self._item(self._first))
+            self._first = None
+        f.write(b"," if self.compact else b",\n")
+        f.write(self._item(record))
+
+    def _item(self, record):
+        if self.compact:
+            return jsonio.dumps(record)
+        # Same layout as json.dump(records, indent=2) produces for each element
+        return b"  " + jsonio.dumps(record, indent=True).replace(b"\n", b"\n  ")
+
+    def close(self):
+        if self.count == 1:
+            self._open().write(jsonio.dumps(self._first, indent=not self.compact))
+            self._first = None
+        elif self.count > 1 and self._file is not None:
+            self._file.write(b"]" if self.compact else b"\n]")
+        super().close()
+
+    def abort(self):
+        self._first = None
+        super().abort()
+
+
+class NdjsonSink(Sink):
+    """One compact JSON record per line (whatever the compact flag)."""
+
+    def write(self, record):
+        self.count += 1
+        self._open().write(jsonio.dumps(record) + b"\n")
+
+
+OUTPUT_FORMATS = {"json": JsonSink, "ndjson": NdjsonSink}
+
+
+def open_sink(path, output_format="json", compact=False, atomic=False):
+    """Returns the sink for an output format (see OUTPUT_FORMATS).
+
+    compact drops the indentation of the json format; ndjson is always
+    compact. atomic only moves the output to path once it is complete.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return OUTPUT_FORMATS[output_format](path, compact=compact, atomic=atomic)
+
+
+def _umask():
+    # Only readable by setting it, so it is set back at once
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
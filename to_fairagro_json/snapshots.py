@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+from . import jsonio
+from .diskcache import DiskCache, content_hash
+
+# Parsed configs are small; this keeps a few hundred versions around
+SNAPSHOT_MAX_BYTES = 16 * 1024 * 1024
+# Overrides the snapshot directory; one of SNAPSHOTS_OFF turns snapshots off
+SNAPSHOT_DIR_ENV = "TO_FAIRAGRO_JSON_SNAPSHOT_DIR"
+SNAPSHOTS_OFF = ("", "none", "off")
+# Stands for default_snapshot_dir(), looked up when a config is loaded
+DEFAULT_SNAPSHOT_DIR = object()
+
+
+def default_snapshot_dir():
+    """Returns the snapshot directory set by the environment, or None if off.
+
+    Without SNAPSHOT_DIR_ENV, snapshots go to the user cache directory.
+    """
+    value = os.environ.get(SNAPSHOT_DIR_ENV)
+    if value is not None:
+        return None if value.strip().lower() in SNAPSHOTS_OFF else Path(value)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "to-fairagro-json" / "config"
+
+
+def load_config(frame_path, mapping_path, framer, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Returns (frame, mapping, config_hash) for a frame and mapping file.
+
+    config_hash identifies the file contents and framing engine. The parsed
+    frame and mapping are kept as a JSON snapshot under that hash in
+    snapshot_dir, so later runs skip importing yaml and parsing the mapping
+    while neither file changes. snapshot_dir defaults to
+    default_snapshot_dir(); snapshot_dir=None always parses, and a snapshot
+    directory that cannot be written to is ignored.
+    """
+    frame_bytes = Path(frame_path).read_bytes()
+    mapping_bytes = Path(mapping_path).read_bytes()
+    # Identifies everything besides the input that determines the output
+    config_hash = content_hash(b"\0".join([frame_bytes, mapping_bytes, framer.encode()]))
+
+    if snapshot_dir is DEFAULT_SNAPSHOT_DIR:
+        snapshot_dir = default_snapshot_dir()
+    snapshots = None
+    if snapshot_dir is not None:
+        try:
+            snapshots = DiskCache(snapshot_dir, max_bytes=SNAPSHOT_MAX_BYTES)
+        except OSError:
+            pass
+    if snapshots is not None:
+        data = snapshots.get(config_hash)
+        if data is not None:
+            snapshot = jsonio.loads(data)
+            return snapshot["frame"], snapshot["mapping"], config_hash
+
+    import yaml
+
+    frame = jsonio.loads(frame_bytes)
+    mapping = yaml.safe_load(mapping_bytes)
+    if snapshots is not None:
+        snapshot = {"frame": frame, "mapping": mapping}
+        try:
+            data = jsonio.dumps(snapshot)
+            # YAML values without a JSON equivalent (dates, non-string keys)
+            # would not read back the same; such mappings are parsed every time
+            if jsonio.loads(data) == snapshot:
+                snapshots.put(config_hash, data)
+        except (OSError, TypeError, ValueError):
+            pass
+    return frame, mapping, config_hash
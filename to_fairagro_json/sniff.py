@@ -0,0 +1,56 @@
+from pathlib import Path
+from . import jsonio
+
+# --type value that picks the profile of each input from its first bytes
+AUTO_PROFILE = "auto"
+PROFILES = ("rocrate", "schemaorg")
+# Bytes of an input inspected to pick its profile
+SNIFF_BYTES = 8192
+
+# An RO-Crate's context and its metadata descriptor both name the spec
+_ROCRATE_MARKERS = (b"w3id.org/ro/crate", b'"ro-crate-metadata.json"', b'"@graph"')
+_WHITESPACE = b" \t\r\n"
+_BOM = b"\xef\xbb\xbf"
+
+
+def sniff_profile(head):
+    """Returns the input profile of a JSON document from its first bytes.
+
+    A top-level array is a list of Schema.org datasets. An object naming
+    the RO-Crate spec in its context or conformsTo, or holding a @graph, is
+    an RO-Crate; any other object (a single dataset, or NDJSON) is
+    Schema.org. Returns None if head does not start a JSON array or object.
+    """
+    if head.startswith(_BOM):
+        head = head[len(_BOM):]
+    head = head.lstrip(_WHITESPACE)
+    if head.startswith(b"["):
+        return "schemaorg"
+    if not head.startswith(b"{"):
+        return None
+    if any(marker in head for marker in _ROCRATE_MARKERS):
+        return "rocrate"
+    return "schemaorg"
+
+
+def _require(profile, path):
+    if profile is None:
+        raise ValueError(f"Cannot detect the input type of {path}: not a JSON object or array")
+    return profile
+
+
+def detect_profile(path):
+    """Returns the profile of an input file, reading only its first SNIFF_BYTES."""
+    with open(path, "rb") as f:
+        return _require(sniff_profile(f.read(SNIFF_BYTES)), path)
+
+
+def load_input(path):
+    """Reads and parses an input file once, returning (profile, data).
+
+    The profile is sniffed from the bytes that are parsed anyway, so routing
+    a file costs no extra read or parse.
+    """
+    data = Path(path).read_bytes()
+    profile = _require(sniff_profile(data[:SNIFF_BYTES]), path)
+    return profile, jsonio.loads(data)
@@ -0,0 +1,122 @@
+import json
+from pathlib import Path
+from . import jsonio
+
+# Characters read per step while scanning a top-level JSON array
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def iter_datasets(source, read_size=READ_SIZE):
+    """Yields the datasets of an input one at a time.
+
+    A file holding a top-level JSON array is scanned element by element and
+    NDJSON is read line by line, so only the current dataset is kept in
+    memory. Any other JSON document is loaded whole and yielded as the only
+    item. Already loaded data (list or dict) is accepted as well.
+    """
+    if not isinstance(source, (str, Path)):
+        if isinstance(source, list):
+            yield from source
+        else:
+            yield source
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        first = _peek(f)
+        if first == "[":
+            yield from _iter_array(f, read_size)
+        elif first == "{":
+            yield from _iter_objects(f)
+        elif first:
+            yield jsonio.loads(f.read())
+
+
+def _peek(f):
+    """Returns the first non-whitespace character and rewinds to it."""
+    while True:
+        pos = f.tell()
+        char = f.read(1)
+        if not char or char not in _WHITESPACE:
+            f.seek(pos)
+            return char
+
+
+def _iter_objects(f):
+    """Yields the objects of NDJSON, or of a document spanning several lines.
+
+    The input is NDJSON if its first line is a complete JSON value on its
+    own; that value is decoded once and yielded as the first dataset (of a
+    single-line document, it is the only one).
+    """
+    line = f.readline()
+    try:
+        value = jsonio.loads(line)
+    except ValueError:
+        yield jsonio.loads(line + f.read())
+        return
+    yield value
+    yield from _iter_ndjson(f, start=2)
+
+
+def _iter_ndjson(f, start=1):
+    for number, line in enumerate(f, start):
+        if line.strip():
+            try:
+                yield jsonio.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid NDJSON on line {number}: {e}") from e
+
+
+def _iter_array(f, read_size):
+    buffer = f.read(read_size)[1:]  # Skip the opening bracket
+    pos = 0
+    eof = False
+    expect_value = True
+    first = True
+
+    while True:
+        # Skip whitespace and separators up to the next element
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(read_size), 0
+            eof = not buffer
+        if pos == len(buffer):
+            raise ValueError("Unterminated JSON array")
+
+        char = buffer[pos]
+        if char == "]":
+            if expect_value and not first:
+                raise ValueError("Trailing ',' in JSON array")
+            return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        # Decode the element, reading more until it is complete
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                value = end = None
+            if end is not None and (end < len(buffer) or eof):
+                break
+            # Incomplete (or possibly truncated scalar): grow the buffer
+            chunk = f.read(max(read_size, len(buffer) - pos))
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        yield value
+        buffer, pos = buffer[end:], 0
+        expect_value = first = False
@@ -0,0 +1,272 @@
+import argparse
+import json
+import random
+from pathlib import Path
+
+ARC_CONTEXT = [
+    "https://w3id.org/ro/crate/1.2/context",
+    {
+        "Sample": "https://bioschemas.org/Sample",
+        "LabProtocol": "https://bioschemas.org/LabProtocol",
+        "LabProcess": "https://bioschemas.org/LabProcess",
+        "executesLabProtocol": "https://bioschemas.org/properties/executesLabProtocol",
+        "parameterValue": "https://bioschemas.org/properties/parameterValue",
+        "columnIndex": "https://w3id.org/ro/terms/arc#columnIndex",
+    },
+]
+SCHEMAORG_CONTEXT = {"@language": "en", "@vocab": "https://schema.org/"}
+
+ORGANISMS = [
+    ("Solanum tuberosum", "http://purl.obolibrary.org/obo/NCBITaxon_4113"),
+    ("Zea mays", "http://purl.obolibrary.org/obo/NCBITaxon_4577"),
+    ("Triticum aestivum", "http://purl.obolibrary.org/obo/NCBITaxon_4565"),
+    ("Hordeum vulgare", "http://purl.obolibrary.org/obo/NCBITaxon_4513"),
+]
+PESTS = [
+    ("Potyvirus yituberosi", "http://purl.obolibrary.org/obo/NCBITaxon_12216"),
+    ("Phytophthora infestans", "http://purl.obolibrary.org/obo/NCBITaxon_4787"),
+    ("Puccinia striiformis", "http://purl.obolibrary.org/obo/NCBITaxon_168172"),
+]
+DRONES = [("DJI", "M4D"), ("DJI", "Mavic 3M"), ("Parrot", "Anafi")]
+WORDS = (
+    "soil crop yield nitrogen water plant field trial biomass root leaf "
+    "drone image sensor season organic maize wheat potato barley"
+).split()
+GIVEN_NAMES = ["Anna", "Jonas", "Lena", "Paul", "Mia", "Felix", "Sophie", "Lukas"]
+FAMILY_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Becker"]
+
+
+def _ref(node_id):
+    return {"@id": node_id}
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _persons(rng, count, organizations):
+    orgs = [
+        {"@id": f"#Organization_{i}", "@type": "Organization",
+         "name": f"Institute of {_text(rng, 2)} {i}"}
+        for i in range(organizations)
+    ]
+    persons = [
+        {
+            "@id": f"http://orcid.org/0000-0000-{i // 10000:04d}-{i % 10000:04d}",
+            "@type": "Person",
+            "givenName": rng.choice(GIVEN_NAMES),
+            "familyName": f"{rng.choice(FAMILY_NAMES)}{i}",
+            "email": f"person{i}@example.org",
+            "affiliation": _ref(orgs[i % len(orgs)]["@id"]),
+        }
+        for i in range(count)
+    ]
+    return orgs, persons
+
+
+def generate_arc_crate(
+    studies=1, assays=1, samples=60, processes_per_sample=1, persons=1,
+    parameters=9, seed=0,
+):
+    """Returns an ARC RO-Crate with the given numbers of nodes.
+
+    Samples are spread over the Studies (one LabProcess per sample), and every
+    Assay runs ``processes_per_sample`` LabProcesses per sample, each with
+    ``parameters`` ParameterValues (two of them the drone manufacturer and
+    model read by the sensor extraction) and one result File.
+    """
+    rng = random.Random(seed)
+    orgs, people = _persons(rng, persons, max(1, persons // 10))
+    graph = [*orgs, *people]
+
+    characteristics = {}
+
+    def characteristic(name, value, uri):
+        node_id = f"#CharacteristicValue_{name}_{value}".replace(" ", "_")
+        if node_id not in characteristics:
+            characteristics[node_id] = {
+                "@id": node_id, "@type": "PropertyValue",
+                "additionalType": "CharacteristicValue", "name": name,
+                "value": value, "valueReference": uri, "columnIndex": "0",
+            }
+        return _ref(node_id)
+
+    sample_nodes = []
+    for i in range(samples):
+        organism = ORGANISMS[i % len(ORGANISMS)]
+        pest = PESTS[i % len(PESTS)]
+        sample_nodes.append({
+            "@id": f"#Material_S{i}", "@type": "Sample", "additionalType": "Material",
+            "name": f"S{i}",
+            "additionalProperty": [
+                characteristic("Organism", *organism),
+                characteristic("Infection Label", rng.choice(["positive", "negative"]), ""),
+                characteristic("Infection Taxon", *pest),
+            ],
+        })
+
+    shared_params = {}
+
+    def shared_parameter(name, value):
+        node_id = f"#ParameterValue_{name}_{value}".replace(" ", "_")
+        if node_id not in shared_params:
+            shared_params[node_id] = {
+                "@id": node_id, "@type": "PropertyValue",
+                "additionalType": "ParameterValue", "name": name, "value": value,
+                "columnIndex": "0",
+            }
+        return _ref(node_id)
+
+    processes, params, files, datasets = [], [], [], []
+    creators = [_ref(p["@id"]) for p in people]
+
+    for s in range(studies):
+        study_id = f"studies/study_{s}/"
+        protocol = f"#Protocol_study_{s}"
+        graph.append({"@id": protocol, "@type": "LabProtocol"})
+        about = []
+        for i in range(s, samples, studies):
+            proc_id = f"#Process_S_study_{s}_{i}"
+            processes.append({
+                "@id": proc_id, "@type": "LabProcess", "name": f"study_{s}_{i}",
+                "object": _ref(sample_nodes[i]["@id"]), "result": [],
+                "executesLabProtocol": _ref(protocol),
+            })
+            about.append(_ref(proc_id))
+        datasets.append({
+            "@id": study_id, "@type": "Dataset", "additionalType": "Study",
+            "identifier": f"study_{s}", "name": f"Study {s}",
+            "description": _text(rng, 20), "creator": creators[s % len(creators)],
+            "hasPart": [], "about": about,
+        })
+
+    graph.append({"@id": "#OA_Drone", "@type": "DefinedTerm", "name": "drone"})
+    graph.append({
+        "@id": "https://bioregistry.io/OBI:0001048", "@type": "DefinedTerm",
+        "name": "digital camera", "termCode": "https://bioregistry.io/OBI:0001048",
+    })
+    for a in range(assays):
+        assay_id = f"assays/assay_{a}/"
+        protocol = f"#Protocol_assay_{a}"
+        graph.append({"@id": protocol, "@type": "LabProtocol"})
+        about, parts = [], []
+        for i in range(samples):
+            manufacturer, model = DRONES[(a + i) % len(DRONES)]
+            for k in range(processes_per_sample):
+                n = i * processes_per_sample + k
+                proc_id = f"#Process_A_assay_{a}_{n}"
+                file_id = f"{assay_id}dataset/{n}.jpg"
+                files.append({"@id": file_id, "@type": "File", "name": file_id})
+                values = [
+                    shared_parameter("Drone Manufacturer", manufacturer),
+                    shared_parameter("Drone Model", model),
+                ]
+                for p in range(max(0, parameters - 2)):
+                    param_id = f"#ParameterValue_A{a}_{n}_{p}"
+                    params.append({
+                        "@id": param_id, "@type": "PropertyValue",
+                        "additionalType": "ParameterValue", "name": f"Parameter {p}",
+                        "value": f"{rng.uniform(-90, 90):+.8f}", "columnIndex": str(p),
+                    })
+                    values.append(_ref(param_id))
+                processes.append({
+                    "@id": proc_id, "@type": "LabProcess", "name": f"assay_{a}_{n}",
+                    "object": _ref(sample_nodes[i]["@id"]), "result": _ref(file_id),
+                    "executesLabProtocol": _ref(protocol), "parameterValue": values,
+                })
+                about.append(_ref(proc_id))
+                parts.append(_ref(file_id))
+        datasets.append({
+            "@id": assay_id, "@type": "Dataset", "additionalType": "Assay",
+            "identifier": f"assay_{a}", "name": f"Assay {a}",
+            "description": _text(rng, 20), "creator": creators[a % len(creators)],
+            "hasPart": parts, "about": about,
+            "measurementMethod": _ref("https://bioregistry.io/OBI:0001048"),
+            "measurementTechnique": _ref("#OA_Drone"),
+        })
+
+    investigation = {
+        "@id": "./", "@type": "Dataset", "additionalType": "Investigation",
+        "identifier": "Synthetic_ARC", "name": "Synthetic ARC",
+        "datePublished": "2026-01-01T00:00:00", "creator": creators,
+        "hasPart": [_ref(d["@id"]) for d in datasets], "license": _ref("#LICENSE"),
+    }
+    graph += [
+        *files, *sample_nodes, *characteristics.values(), *shared_params.values(),
+        *params, *processes, *datasets, investigation,
+        {"@id": "#LICENSE", "@type": "CreativeWork", "text": "CC BY 4.0"},
+    ]
+    return {"@context": ARC_CONTEXT, "@graph": graph}
+
+
+def generate_schemaorg_array(datasets=100, creators=3, keywords=5, with_ids=True, seed=0):
+    """Returns a flat list of independent Schema.org Dataset records."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(datasets):
+        doi = f"10.5072/synthetic.{seed}.{i}"
+        west, south = rng.uniform(5, 14), rng.uniform(47, 54)
+        record = {
+            "@context": SCHEMAORG_CONTEXT,
+            "@type": "Dataset",
+            "name": _text(rng, 6),
+            "alternativeHeadline": _text(rng, 4),
+            "description": _text(rng, 60),
+            "identifier": [{"@type": "PropertyValue", "propertyID": "doi", "value": doi}],
+            "creator": [
+                {
+                    "@type": "Person",
+                    "givenName": rng.choice(GIVEN_NAMES),
+                    "familyName": rng.choice(FAMILY_NAMES),
+                    "identifier": f"https://orcid.org/0000-0001-{i % 10000:04d}-{c:04d}",
+                    "affiliation": {"@type": "Organization", "name": f"Institute {c}"},
+                }
+                for c in range(creators)
+            ],
+            "keywords": [rng.choice(WORDS) for _ in range(keywords)],
+            "datePublished": f"20{10 + i % 16}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "license": "https://creativecommons.org/licenses/by/4.0/",
+            "spatialCoverage": {
+                "@type": "Place",
+                "geo": {
+                    "@type": "GeoShape",
+                    "box": f"{south:.4f} {west:.4f} {south + 0.5:.4f} {west + 0.5:.4f}",
+                },
+            },
+        }
+        if with_ids:
+            record["@id"] = f"https://doi.org/{doi}"
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic input corpus")
+    parser.add_argument("kind", choices=["rocrate", "schemaorg"])
+    parser.add_argument("output", help="Output JSON path")
+    parser.add_argument("--studies", type=int, default=1)
+    parser.add_argument("--assays", type=int, default=1)
+    parser.add_argument("--samples", type=int, default=60)
+    parser.add_argument("--processes-per-sample", type=int, default=1)
+    parser.add_argument("--persons", type=int, default=1)
+    parser.add_argument("--datasets", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.kind == "rocrate":
+        data = generate_arc_crate(
+            studies=args.studies, assays=args.assays, samples=args.samples,
+            processes_per_sample=args.processes_per_sample, persons=args.persons,
+            seed=args.seed,
+        )
+    else:
+        data = generate_schemaorg_array(datasets=args.datasets, seed=args.seed)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import json
+from pathlib import Path
+import jsonschema
+
+SCHEMA_PATH = Path(__file__).parent.parent / "fairagro-schema.json"
+
+
+class RecordValidator:
+    """Validates output records against the FAIRagro schema.
+
+    The schema is loaded and its Draft4Validator built once, then reused for
+    every record. Valid records take a fast path that stops at the first
+    error check instead of collecting all errors.
+    """
+
+    def __init__(self, schema_path=SCHEMA_PATH):
+        with open(schema_path, "r", encoding="utf-8") as f:
+            schema = json.load(f)
+        jsonschema.Draft4Validator.check_schema(schema)
+        self.validator = jsonschema.Draft4Validator(schema)
+
+    def errors(self, record):
+        """Returns the record's errors as {"path", "message"} dicts (empty if valid)."""
+        if self.validator.is_valid(record):
+            return []
+        errors = sorted(self.validator.iter_errors(record), key=lambda e: list(map(str, e.path)))
+        return [
+            {"path": ".".join(str(p) for p in error.path), "message": error.message}
+            for error in errors
+        ]